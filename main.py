@@ -7,14 +7,12 @@ import customtkinter as ctk
 import pyttsx3
 import speech_recognition as sr
 import threading
+import queue
 import time
 import requests
-import vosk
-import sounddevice as sd
 import os
 import psutil
 import webbrowser
-import subprocess
 import platform
 import sqlite3
 from datetime import datetime
@@ -22,25 +20,473 @@ from pathlib import Path
 import json
 from difflib import SequenceMatcher
 import mimetypes
+import fnmatch
+import bisect
+import heapq
+import numpy as np
+import re
+import argparse
+import asyncio
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
 
+# Ordered spelling-to-sound rewrites for phonetic_keys, in the spirit of Metaphone
+PHONETIC_RULES = [
+    (re.compile(r'^(kn|gn|pn)'), 'n'),
+    (re.compile(r'^wr'), 'r'),
+    (re.compile(r'^ps'), 's'),
+    (re.compile(r'^x'), 's'),
+    (re.compile(r'^wh'), 'w'),
+    (re.compile(r'mb$'), 'm'),
+    (re.compile(r'tch'), 'ch'),
+    (re.compile(r'sch'), 'sk'),
+    (re.compile(r'chr'), 'kr'),
+    (re.compile(r'ph'), 'f'),
+    (re.compile(r'(?<=.)gh'), ''),
+    (re.compile(r'ck'), 'k'),
+    (re.compile(r'dg(?=[eiy])'), 'j'),
+    (re.compile(r'(ch|sh|sio|tio)'), 'X'),
+    (re.compile(r'th'), '0'),
+    (re.compile(r'c(?=[eiy])'), 's'),
+    (re.compile(r'[cq]'), 'k'),
+    (re.compile(r'x'), 'ks'),
+    (re.compile(r'g(?=[eiy])'), 'j'),
+    (re.compile(r'z'), 's'),
+    (re.compile(r'v'), 'f'),
+]
+
+# Looser second key: voiced and unvoiced pairs fold together
+PHONETIC_LOOSE = str.maketrans({'b': 'p', 'd': 't', 'g': 'k', 'j': 'X', '0': 't'})
+
+
+def phonetic_keys(text):
+    """Primary and looser phonetic keys for text, ignoring spaces and punctuation
+
+    "fire fox" and "Firefox" both give FRFKS; "spot if I" and "Spotify"
+    both give SPTF. Digits are kept as written after the sound key, so
+    "IMG_20240042" and "img 2024 0042" give AMK20240042 while other photos
+    get keys of their own. Returns an empty tuple when text has neither.
+    """
+    text = text.lower()
+    word = re.sub(r'[^a-z]', '', text)
+    digits = ''.join(re.findall(r'[0-9]+', text))
+    if not word:
+        return (digits,) if digits else ()
+
+    for pattern, replacement in PHONETIC_RULES:
+        word = pattern.sub(replacement, word)
+
+    # Keep a leading vowel as a marker, drop the rest and any silent h/w/y
+    first = 'A' if word[0] in 'aeiou' else word[0]
+    body = re.sub(r'[aeiouhwy]', '', word[1:])
+
+    def collapse(key):
+        return re.sub(r'(.)\1+', r'\1', key).upper()
+
+    primary = collapse(first + body) + digits
+    loose = collapse((first + body).translate(PHONETIC_LOOSE)) + digits
+    return (primary,) if loose == primary else (primary, loose)
+
+
+class PhoneticIndex:
+    """Hash index from phonetic keys to the entries whose names produce them"""
+
+    def __init__(self):
+        self._buckets = {}
+        self._keys = {}
+
+    def add(self, entry, names):
+        """Index entry under the phonetic keys of every name, replacing earlier keys"""
+        self.remove(entry)
+        keys = {key for name in names for key in phonetic_keys(name)}
+        self._keys[entry] = keys
+        for key in keys:
+            self._buckets.setdefault(key, set()).add(entry)
+
+    def remove(self, entry):
+        for key in self._keys.pop(entry, ()):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(entry)
+                if not bucket:
+                    del self._buckets[key]
+
+    def candidates(self, query):
+        """Entries sharing a phonetic key with query; primary-key matches come first"""
+        keys = phonetic_keys(query)
+        if not keys:
+            return []
+        primary = self._buckets.get(keys[0], set())
+        loose = set()
+        for key in keys[1:]:
+            loose |= self._buckets.get(key, set())
+        return list(primary) + list(loose - primary)
+
+
+# Typical Vosk/Google misrecognitions, paired with the app the user meant
+PHONETIC_EVAL_CORPUS = [
+    ("fire fox", "Firefox"), ("fire socks", "Firefox"), ("spot if i", "Spotify"),
+    ("spot ify", "Spotify"), ("crome", "Google Chrome"), ("krome", "Google Chrome"),
+    ("google crome", "Google Chrome"), ("v l c", "VLC"), ("this cord", "Discord"),
+    ("dis cord", "Discord"), ("tell a gram", "Telegram"), ("tele gram", "Telegram"),
+    ("thunder bird", "Thunderbird"), ("libra office", "LibreOffice"),
+    ("libre office", "LibreOffice"), ("ink scape", "Inkscape"), ("jimp", "GIMP"),
+    ("blend her", "Blender"), ("steem", "Steam"), ("slag", "Slack"), ("zum", "Zoom"),
+    ("odd a city", "Audacity"), ("key pass", "KeePass"), ("file zilla", "FileZilla"),
+    ("e vince", "Evince"), ("not ill us", "Nautilus"), ("rhythm books", "Rhythmbox"),
+    ("sig nal", "Signal"), ("oprah", "Opera"), ("sky pee", "Skype"),
+    ("what's app", "WhatsApp"), ("teems", "Microsoft Teams"), ("out look", "Outlook"),
+    ("calcu later", "Calculator"), ("trans mission", "Transmission"),
+    ("shot well", "Shotwell"), ("k den live", "Kdenlive"), ("dolfin", "Dolphin"),
+    ("post man", "Postman"), ("pie charm", "PyCharm"), ("obsidean", "Obsidian"),
+    ("visual studio cod", "Visual Studio Code"), ("note pad", "Notepad"),
+    # Sound-alike spellings too far apart for a 0.6 edit-similarity cut-off
+    ("fyre focks", "Firefox"), ("kroam", "Google Chrome"), ("krohm", "Google Chrome"),
+    ("stiim", "Steam"), ("teemz", "Microsoft Teams"), ("owt luk", "Outlook"), ("zuum", "Zoom"),
+]
+
+PHONETIC_EVAL_DISTRACTORS = [
+    "Terminal", "Files", "Settings", "Software", "Text Editor", "Clocks", "Weather",
+    "Maps", "Photos", "Videos", "Music", "Contacts", "Calendar", "Camera", "Firewall",
+    "Fonts", "Spectacle", "Okular", "Konsole", "Krita", "Darktable", "Handbrake",
+    "OBS Studio", "Steam Link", "Slack Desktop", "Spotlight", "Discover", "Telnet",
+    "Thunar", "Geany", "Gedit", "Vim", "Emacs", "Kate", "Brave", "Vivaldi", "Edge",
+    "Safari", "Mail", "Notes", "Reminders", "Podcasts", "Preview", "Paint",
+]
+
+
+def evaluate_phonetic_matching(corpus=None, distractors=None, repeats=20):
+    """Compare phonetic lookup against plain fuzzy matching on misrecognised app names
+
+    An in-memory app cache is built from the corpus targets plus distractor
+    names, then every misrecognition is resolved both ways.
+    """
+    corpus = PHONETIC_EVAL_CORPUS if corpus is None else corpus
+    distractors = PHONETIC_EVAL_DISTRACTORS if distractors is None else distractors
+
+    scanner = SystemScanner(scan=False)
+    for name in dict.fromkeys([target for _, target in corpus] + list(distractors)):
+        scanner.app_cache[name.lower()] = {
+            'name': name,
+            'path': None,
+            'keywords': scanner._generate_keywords(name)
+        }
+    scanner._build_app_phonetic_index()
+
+    report = {'queries': len(corpus)}
+    for label, find in (('phonetic', scanner.find_app), ('fuzzy', scanner._fuzzy_find_app)):
+        misses = []
+        started = time.perf_counter()
+        for _ in range(repeats):
+            results = [find(heard) for heard, _ in corpus]
+        elapsed = time.perf_counter() - started
+        for (heard, target), result in zip(corpus, results):
+            if not result or result['name'] != target:
+                misses.append(f"{heard} -> {result['name'] if result else None}")
+        report[f'{label}_accuracy'] = 1 - len(misses) / len(corpus)
+        report[f'{label}_ms_per_query'] = elapsed / (repeats * len(corpus)) * 1000
+        report[f'{label}_misses'] = misses
+    return report
+
+
+class IndexRules:
+    """Decides which directories the file indexer descends into and which files it records
+
+    Exclude patterns are shell globs matched against entry names. Ignore
+    files (.gitignore by default) are read in every directory that is
+    entered and apply, gitignore-style, to everything below it.
+    """
+
+    DEFAULT_EXCLUDES = [
+        '.git', '.hg', '.svn', 'node_modules', '__pycache__', '.venv', 'venv',
+        '.tox', '.nox', '.mypy_cache', '.pytest_cache', '.cache', 'site-packages',
+        'bower_components', '.gradle', '.idea', '$RECYCLE.BIN', 'System Volume Information',
+        '*.tmp', '*.swp', '~$*', '.DS_Store', 'Thumbs.db', 'desktop.ini',
+    ]
+
+    def __init__(self, exclude=None, ignore_files=('.gitignore', '.ignore'), skip_hidden=True,
+                 max_depth=None, max_file_size=None, max_files_per_root=50000):
+        self.exclude = list(self.DEFAULT_EXCLUDES if exclude is None else exclude)
+        self.ignore_files = tuple(ignore_files)
+        self.skip_hidden = skip_hidden
+        self.max_depth = max_depth                    # None walks the full tree
+        self.max_file_size = max_file_size            # bytes, None for no cap
+        self.max_files_per_root = max_files_per_root  # None for no budget
+
+    @classmethod
+    def from_dict(cls, config):
+        """Build rules from a (JSON) preferences dict; unknown keys are ignored"""
+        names = ('exclude', 'ignore_files', 'skip_hidden', 'max_depth',
+                 'max_file_size', 'max_files_per_root')
+        return cls(**{name: config[name] for name in names if name in config})
+
+    def load_ignore_file(self, directory, inherited):
+        """Ignore patterns in effect inside directory: inherited ones plus its own files"""
+        patterns = list(inherited)
+        for ignore_name in self.ignore_files:
+            try:
+                with open(os.path.join(directory, ignore_name), encoding='utf-8', errors='ignore') as f:
+                    lines = f.read().splitlines()
+            except OSError:
+                continue
+
+            for line in lines:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                negate = line.startswith('!')
+                if negate:
+                    line = line[1:]
+                dir_only = line.endswith('/')
+                line = line.rstrip('/')
+                # A slash anywhere but the end, leading one included, makes the
+                # pattern relative to the ignore file
+                anchored = '/' in line
+                line = line.lstrip('/')
+                if line:
+                    patterns.append((directory, line, anchored, dir_only, negate))
+        return patterns
+
+    def _ignored(self, path, name, is_dir, ignores):
+        """gitignore semantics: the last matching pattern wins"""
+        ignored = False
+        for base, pattern, anchored, dir_only, negate in ignores:
+            if dir_only and not is_dir:
+                continue
+            if anchored:
+                relative = os.path.relpath(path, base).replace(os.sep, '/')
+                matched = fnmatch.fnmatch(relative, pattern)
+            else:
+                matched = fnmatch.fnmatch(name, pattern)
+            if matched:
+                ignored = not negate
+        return ignored
+
+    def _excluded(self, name):
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.exclude)
+
+    def prune_dir(self, entry, depth, ignores):
+        """Reason not to descend into a directory entry, or None"""
+        if entry.is_symlink():
+            return 'symlink'
+        if self.skip_hidden and entry.name.startswith('.'):
+            return 'hidden'
+        if self._excluded(entry.name):
+            return 'excluded'
+        if self.max_depth is not None and depth >= self.max_depth:
+            return 'max_depth'
+        if ignores and self._ignored(entry.path, entry.name, True, ignores):
+            return 'ignore_file'
+        return None
+
+    def skip_file(self, entry, size, ignores):
+        """Reason not to index a file entry, or None"""
+        if self.skip_hidden and entry.name.startswith('.'):
+            return 'hidden'
+        if self._excluded(entry.name):
+            return 'excluded'
+        if self.max_file_size is not None and size > self.max_file_size:
+            return 'too_large'
+        if ignores and self._ignored(entry.path, entry.name, False, ignores):
+            return 'ignore_file'
+        return None
+
+
+class FileAttributeIndex:
+    """Sorted secondary indexes over file_index for recency, size and type queries
+
+    Each bucket (all files, a full mime type like application/pdf, its major
+    type like video, and a coarse category like document) keeps lists of
+    (modified, key) and (size, key) in sorted order. Top-k and "since"
+    queries walk one end of a list instead of scanning every file.
+    """
+
+    ORDERS = {
+        # order: (attribute, newest/largest first)
+        'latest': ('modified', True),
+        'oldest': ('modified', False),
+        'largest': ('size', True),
+        'smallest': ('size', False),
+    }
+
+    DOCUMENT_MARKERS = ('pdf', 'msword', 'document', 'spreadsheet', 'presentation',
+                        'excel', 'powerpoint', 'rtf')
+    ARCHIVE_MARKERS = ('zip', 'tar', 'rar', '7z', 'compressed', 'gzip', 'bzip')
+
+    def __init__(self):
+        self._sorted = {'modified': {}, 'size': {}}
+        self._entries = {}
+        self._lock = threading.Lock()        # held by readers and for swaps
+        self._write_lock = threading.Lock()  # serialises writers
+
+    def __len__(self):
+        return len(self._entries)
+
+    @classmethod
+    def buckets_for(cls, mime):
+        """Every bucket a file of the given mime type belongs to"""
+        buckets = [None]
+        if mime:
+            major = mime.split('/')[0]
+            buckets += [mime, major]
+            if major == 'text' or any(marker in mime for marker in cls.DOCUMENT_MARKERS):
+                buckets.append('document')
+            elif any(marker in mime for marker in cls.ARCHIVE_MARKERS):
+                buckets.append('archive')
+        return buckets
+
+    def add(self, key, data):
+        """Index a single file record, replacing any previous record under the same key"""
+        with self._write_lock, self._lock:
+            self._remove(key)
+            self._entries[key] = data
+            for attribute, by_bucket in self._sorted.items():
+                for bucket in self.buckets_for(data['type']):
+                    bisect.insort(by_bucket.setdefault(bucket, []), (data[attribute], key))
+
+    def add_many(self, items):
+        """Index many (key, data) records at once
+
+        Entries are appended and every touched bucket is sorted once, so a
+        bulk load costs O(n log n) rather than one O(n) insort per file.
+        Touched lists are rebuilt off to the side and swapped in, untouched
+        ones are shared, so queries are only blocked for the swap.
+        """
+        items = list(dict(items).items())  # the last record for a key wins
+        if not items:
+            return
+        with self._write_lock:
+            replaced = {key for key, _ in items if key in self._entries}
+            added = {attribute: {} for attribute in self._sorted}
+            touched = {bucket for key in replaced for bucket in self.buckets_for(self._entries[key]['type'])}
+            bucket_cache = {}
+            for key, data in items:
+                mime = data['type']
+                buckets = bucket_cache.get(mime)
+                if buckets is None:
+                    buckets = bucket_cache[mime] = self.buckets_for(mime)
+                    touched.update(buckets)
+                for attribute, by_bucket in added.items():
+                    item = (data[attribute], key)
+                    for bucket in buckets:
+                        by_bucket.setdefault(bucket, []).append(item)
+
+            rebuilt = {}
+            for attribute, by_bucket in self._sorted.items():
+                lists = dict(by_bucket)
+                for bucket in touched:
+                    old_entries = by_bucket.get(bucket, ())
+                    if replaced:
+                        old_entries = [item for item in old_entries if item[1] not in replaced]
+                    new_entries = added[attribute].get(bucket)
+                    if new_entries:
+                        new_entries.sort()
+                        entries = self._merge(old_entries, new_entries)
+                    else:
+                        entries = list(old_entries)
+                    if entries:
+                        lists[bucket] = entries
+                    else:
+                        lists.pop(bucket, None)
+                rebuilt[attribute] = lists
+
+            with self._lock:
+                self._sorted = rebuilt
+                self._entries.update(items)
+
+    @staticmethod
+    def _merge(entries, new_entries):
+        """Merge two sorted lists by bisecting for each new item and copying
+        the runs of old items between them in slices"""
+        if not entries:
+            return new_entries
+        merged = []
+        start = 0
+        for item in new_entries:
+            position = bisect.bisect_left(entries, item, start)
+            merged += entries[start:position]
+            merged.append(item)
+            start = position
+        merged += entries[start:]
+        return merged
+
+    def remove(self, key):
+        with self._write_lock, self._lock:
+            self._remove(key)
+
+    def _remove(self, key):
+        data = self._entries.pop(key, None)
+        if data is None:
+            return
+        for attribute, by_bucket in self._sorted.items():
+            item = (data[attribute], key)
+            for bucket in self.buckets_for(data['type']):
+                entries = by_bucket[bucket]
+                position = bisect.bisect_left(entries, item)
+                if position < len(entries) and entries[position] == item:
+                    del entries[position]
+                if not entries:
+                    del by_bucket[bucket]
+
+    def top(self, order='latest', bucket=None, k=1, under=None, since=None):
+        """Up to k file records in the given order, optionally within a folder or time window
+
+        `since` (a timestamp) only applies to the recency orders; the walk
+        stops at the first file older than it.
+        """
+        attribute, descending = self.ORDERS[order]
+        if under:
+            under = os.path.normcase(os.path.join(os.path.abspath(under), ''))
+
+        results = []
+        with self._lock:
+            entries = self._sorted[attribute].get(bucket, [])
+            if since is not None and attribute == 'modified' and not descending:
+                start = bisect.bisect_left(entries, (since,))
+                ordered = (entries[i] for i in range(start, len(entries)))
+            else:
+                ordered = reversed(entries) if descending else iter(entries)
+
+            for value, key in ordered:
+                if since is not None and attribute == 'modified' and value < since:
+                    break
+                data = self._entries[key]
+                if under and not os.path.normcase(data['path']).startswith(under):
+                    continue
+                results.append(data)
+                if len(results) >= k:
+                    break
+        return results
+
+
 class SystemScanner:
     """Intelligently scans and indexes installed applications and files"""
 
-    def __init__(self):
+    def __init__(self, scan=True):
         self.system = platform.system()
         self.app_cache = {}
-        self.file_index = {}
+        self.app_phonetic = PhoneticIndex()
+        self.file_index = {}    # full path -> file record
+        self.file_names = {}    # lowercase file name -> set of full paths
+        self.file_attributes = FileAttributeIndex()
+        self.file_phonetic = PhoneticIndex()
+        # Guards file_index, file_names and file_phonetic: the background
+        # indexer writes them while commands read them
+        self._files_lock = threading.RLock()
+        self.index_stats = {}
         self.last_scan = None
-        self.init_scan()
+        if scan:
+            self.init_scan()
 
     def init_scan(self):
         """Initial system scan on startup"""
         print("🔍 Scanning system for installed applications...")
         self.scan_installed_apps()
+        self._build_app_phonetic_index()
         print(f"✓ Found {len(self.app_cache)} applications")
 
     def scan_installed_apps(self):
@@ -196,9 +642,51 @@ class SystemScanner:
 
         return list(keywords)
 
+    def _build_app_phonetic_index(self):
+        """Compute phonetic keys once per app after a scan"""
+        self.app_phonetic = PhoneticIndex()
+        for app_key, app_data in self.app_cache.items():
+            self.app_phonetic.add(app_key, app_data['keywords'])
+
+    @staticmethod
+    def _rerank(query, candidates, names_of, threshold=0.4):
+        """Best candidate by space-insensitive edit similarity, or None
+
+        Candidates are scored on their best-matching name; ties go to the
+        candidate whose full key (passed first by names_of) is closest, so
+        "steem" picks Steam over Steam Link.
+        """
+        matcher = SequenceMatcher(None)
+        matcher.set_seq2(query.replace(' ', ''))
+        best_match = None
+        best_score = (threshold, 0.0)
+        for candidate in candidates:
+            scores = []
+            for name in names_of(candidate):
+                matcher.set_seq1(name.replace(' ', ''))
+                scores.append(matcher.ratio())
+            score = (max(scores), scores[0])
+            if score > best_score:
+                best_score = score
+                best_match = candidate
+        return best_match
+
     def find_app(self, query):
-        """Intelligently find app using fuzzy matching"""
+        """Intelligently find app: exact name, then phonetic lookup, then fuzzy matching"""
         query = query.lower().strip()
+        if query in self.app_cache:
+            return self.app_cache[query]
+
+        candidates = self.app_phonetic.candidates(query)
+        if candidates:
+            best = self._rerank(query, candidates, lambda key: [key] + self.app_cache[key]['keywords'])
+            if best is not None:
+                return self.app_cache[best]
+
+        return self._fuzzy_find_app(query)
+
+    def _fuzzy_find_app(self, query):
+        """Scan every app with SequenceMatcher"""
         best_match = None
         best_score = 0
 
@@ -216,8 +704,17 @@ class SystemScanner:
 
         return best_match
 
-    def index_user_files(self, directories=None):
+    def index_user_files(self, directories=None, rules=None):
         """Index user files for quick searching"""
+        for _ in self.iter_index_user_files(directories, rules):
+            pass
+
+    def iter_index_user_files(self, directories=None, rules=None):
+        """Index user files one directory at a time, yielding after each one
+
+        The generator keeps its own walk state, so a caller can stop pulling
+        from it (e.g. under load) and later resume exactly where it left off.
+        """
         if directories is None:
             directories = [
                 os.path.expanduser('~/Documents'),
@@ -227,47 +724,220 @@ class SystemScanner:
                 os.path.expanduser('~/Videos'),
                 os.path.expanduser('~/Pictures'),
             ]
+        if rules is None:
+            rules = IndexRules()
 
         for directory in directories:
+            directory = os.path.expanduser(directory)
             if os.path.exists(directory):
-                self._index_directory(directory)
+                yield from self._iter_index_directory(directory, rules)
 
-    def _index_directory(self, directory, max_depth=3, current_depth=0):
+    def _index_directory(self, directory, rules=None):
         """Recursively index files in directory"""
-        if current_depth >= max_depth:
-            return
-
-        try:
-            for item in os.listdir(directory):
-                full_path = os.path.join(directory, item)
-
-                if os.path.isfile(full_path):
-                    name_lower = item.lower()
-                    self.file_index[name_lower] = {
-                        'name': item,
-                        'path': full_path,
-                        'size': os.path.getsize(full_path),
-                        'modified': os.path.getmtime(full_path),
-                        'type': mimetypes.guess_type(full_path)[0]
-                    }
-                elif os.path.isdir(full_path):
-                    self._index_directory(full_path, max_depth, current_depth + 1)
-        except OSError:
+        for _ in self._iter_index_directory(directory, rules or IndexRules()):
             pass
 
+    def _iter_index_directory(self, directory, rules):
+        """Walk directory depth-first, yielding the path of each directory indexed
+
+        Exclusion rules are checked before a directory is opened, so pruned
+        trees cost nothing beyond their parent's listing. Indexing stops once
+        the root's file budget is spent. Counts land in self.index_stats.
+        """
+        stats = {'files': 0, 'dirs': 0, 'pruned_dirs': {}, 'skipped_files': {},
+                 'budget_exhausted': False}
+        self.index_stats[directory] = stats
+        pending = [(directory, 0, rules.load_ignore_file(directory, []))]
+        batch = []
+        flushed_at = time.monotonic()
+        since_checkpoint = 0
+
+        while pending:
+            current, depth, ignores = pending.pop()
+            try:
+                entries = list(os.scandir(current))
+            except OSError:
+                continue
+            stats['dirs'] += 1
+
+            for entry in entries:
+                # Checkpoint inside huge directories too, not only between them
+                since_checkpoint += 1
+                if since_checkpoint >= self.INDEX_CHECKPOINT_EVERY:
+                    since_checkpoint = 0
+                    if self._flush_due(batch, flushed_at):
+                        self.add_files(batch)
+                        batch, flushed_at = [], time.monotonic()
+                    yield current
+
+                try:
+                    if entry.is_dir():
+                        reason = rules.prune_dir(entry, depth + 1, ignores)
+                        if reason:
+                            stats['pruned_dirs'][reason] = stats['pruned_dirs'].get(reason, 0) + 1
+                        else:
+                            pending.append((entry.path, depth + 1,
+                                            rules.load_ignore_file(entry.path, ignores)))
+                        continue
+
+                    if not entry.is_file():
+                        continue
+                    info = entry.stat()
+                    reason = rules.skip_file(entry, info.st_size, ignores)
+                    if reason:
+                        stats['skipped_files'][reason] = stats['skipped_files'].get(reason, 0) + 1
+                        continue
+
+                    batch.append({
+                        'name': entry.name,
+                        'path': entry.path,
+                        'size': info.st_size,
+                        'modified': info.st_mtime,
+                        'type': mimetypes.guess_type(entry.name)[0]
+                    })
+                    stats['files'] += 1
+                except OSError:
+                    continue
+
+                if rules.max_files_per_root and stats['files'] >= rules.max_files_per_root:
+                    stats['budget_exhausted'] = True
+                    pending.clear()
+                    break
+
+            if self._flush_due(batch, flushed_at):
+                self.add_files(batch)
+                batch, flushed_at = [], time.monotonic()
+            yield current
+
+        self.add_files(batch)
+        pruned = sum(stats['pruned_dirs'].values())
+        print(f"✓ Indexed {stats['files']} files in {directory} "
+              f"({pruned} directories pruned{', file budget reached' if stats['budget_exhausted'] else ''})")
+
+    # Records collected during a walk are bulk-added to the indexes at the
+    # next checkpoint once there are this many, or once this many seconds
+    # have passed, so files become findable while the walk goes on
+    INDEX_FLUSH_EVERY = 2000
+    INDEX_FLUSH_SECONDS = 1.0
+
+    # Directory entries processed between scheduler checkpoints
+    INDEX_CHECKPOINT_EVERY = 500
+
+    def _flush_due(self, batch, flushed_at):
+        return bool(batch) and (len(batch) >= self.INDEX_FLUSH_EVERY or
+                                time.monotonic() - flushed_at >= self.INDEX_FLUSH_SECONDS)
+
+    def _store_file(self, data):
+        path = data['path']
+        old = self.file_index.get(path)
+        if old is not None and old['name'].lower() != data['name'].lower():
+            self._forget_name(old['name'].lower(), path)
+        self.file_index[path] = data
+        self.file_names.setdefault(data['name'].lower(), set()).add(path)
+        self.file_phonetic.add(path, [os.path.splitext(data['name'].lower())[0]])
+
+    def _forget_name(self, name, path):
+        paths = self.file_names.get(name)
+        if paths is not None:
+            paths.discard(path)
+            if not paths:
+                del self.file_names[name]
+
+    def add_file(self, data):
+        """Store one file record (keyed by its path) and update the secondary indexes"""
+        with self._files_lock:
+            self._store_file(data)
+        self.file_attributes.add(data['path'], data)
+
+    def add_files(self, records):
+        """Store many file records, sorting the attribute indexes once"""
+        for data in records:
+            # Locked per record so lookups are never held up by a whole batch
+            with self._files_lock:
+                self._store_file(data)
+        self.file_attributes.add_many([(data['path'], data) for data in records])
+
+    def remove_file(self, path):
+        with self._files_lock:
+            data = self.file_index.pop(path, None)
+            if data is not None:
+                self._forget_name(data['name'].lower(), path)
+            self.file_phonetic.remove(path)
+        self.file_attributes.remove(path)
+
+    def query_files(self, order='latest', bucket=None, k=1, under=None, since=None):
+        """Top-k files by recency or size, see FileAttributeIndex.top"""
+        return self.file_attributes.top(order, bucket, k, under, since)
+
+    def index_summary(self):
+        """One-line totals over every indexed root"""
+        files = sum(stats['files'] for stats in self.index_stats.values())
+        pruned = sum(sum(stats['pruned_dirs'].values()) for stats in self.index_stats.values())
+        skipped = sum(sum(stats['skipped_files'].values()) for stats in self.index_stats.values())
+        capped = sum(1 for stats in self.index_stats.values() if stats['budget_exhausted'])
+        summary = f"{files} files indexed, {pruned} directories pruned, {skipped} files skipped"
+        if capped:
+            summary += f", {capped} root(s) hit the file budget"
+        return summary
+
+    def _newest_named(self, name):
+        """Most recently modified file with the given lowercase name"""
+        with self._files_lock:
+            records = [self.file_index[path] for path in self.file_names.get(name, ())
+                       if path in self.file_index]
+        return max(records, key=lambda data: data['modified']) if records else None
+
+    # Most phonetic candidates reranked by edit similarity; larger buckets
+    # are narrowed to the names closest in length first
+    FILE_RERANK_LIMIT = 200
+
     def find_file(self, query):
-        """Find file using fuzzy matching"""
-        query = query.lower().strip()
-        best_match = None
-        best_score = 0
+        """Find file by phonetic lookup first, falling back to fuzzy matching
 
-        for file_key, file_data in self.file_index.items():
-            score = SequenceMatcher(None, query, file_key).ratio()
-            if score > best_score and score > 0.5:
-                best_score = score
-                best_match = file_data
+        Several folders can hold files with the same name; the most
+        recently modified one wins. Only the lookups hold the index lock;
+        scoring runs on snapshots so the indexer carries on meanwhile.
+        """
+        query = query.lower().strip()
+        with self._files_lock:
+            if query in self.file_names:
+                return self._newest_named(query)
+
+            candidates = {path: self.file_index[path]['name'].lower()
+                          for path in self.file_phonetic.candidates(os.path.splitext(query)[0])}
+            if not candidates:
+                names = list(self.file_names)
+
+        if candidates:
+            if len(candidates) > self.FILE_RERANK_LIMIT:
+                closest = heapq.nsmallest(self.FILE_RERANK_LIMIT, candidates,
+                                          key=lambda path: abs(len(candidates[path]) - len(query)))
+                candidates = {path: candidates[path] for path in closest}
+
+            def names_of(path):
+                name = candidates[path]
+                return [name, os.path.splitext(name)[0]]
+            best = self._rerank(query, candidates, names_of)
+            if best is not None:
+                return self._newest_named(candidates[best])
+            with self._files_lock:
+                names = list(self.file_names)
+
+        # Cheap upper bounds on the ratio skip most names without a full comparison
+        matcher = SequenceMatcher(None)
+        matcher.set_seq2(query)
+        best_name = None
+        best_score = 0.5
+
+        for name in names:
+            matcher.set_seq1(name)
+            if matcher.real_quick_ratio() > best_score and matcher.quick_ratio() > best_score:
+                score = matcher.ratio()
+                if score > best_score:
+                    best_score = score
+                    best_name = name
 
-        return best_match
+        return self._newest_named(best_name) if best_name else None
 
 
 class ProcessManager:
@@ -299,21 +969,378 @@ class ProcessManager:
                 return proc_info
         return None
 
-    def close_app_by_name(self, app_name):
-        """Intelligently close app by name"""
-        app_name = app_name.lower()
-        killed_count = 0
+    # Folders shared by unrelated programs; living there doesn't make a
+    # process part of an app
+    SHARED_BIN_DIRS = {os.path.normcase(path) for path in (
+        '/bin', '/sbin', '/usr/bin', '/usr/sbin', '/usr/local/bin', '/usr/local/sbin',
+        '/usr/libexec', '/snap/bin', '/opt/homebrew/bin',
+        os.environ.get('SystemRoot', r'C:\Windows'),
+        os.path.join(os.environ.get('SystemRoot', r'C:\Windows'), 'System32'),
+    )}
+
+    # Shorter names must match a process name exactly ("vi" is not vivaldi)
+    MIN_PREFIX = 4
+
+    # Linux truncates process names to this many characters
+    PROC_NAME_LIMIT = 15
+
+    @classmethod
+    def _name_matches(cls, proc_name, app_name):
+        """Whole-name or prefix match ("firefox" matches firefox-bin, "term" not gnome-terminal)"""
+        proc_name = proc_name.lower()
+        if proc_name.endswith('.exe'):
+            proc_name = proc_name[:-4]
+        words = app_name.split()
+        for form in {app_name, app_name.replace(' ', ''), words[-1] if words else ''}:
+            if not form:
+                continue
+            if proc_name == form or (len(form) >= cls.MIN_PREFIX and proc_name.startswith(form)):
+                return True
+            if len(proc_name) == cls.PROC_NAME_LIMIT and form.startswith(proc_name):
+                return True
+        return False
+
+    @classmethod
+    def _app_home(cls, exe):
+        """Folder holding an app's own executables, or None if it is a shared bin folder"""
+        if not exe:
+            return None
+        bundle = exe.find('.app' + os.sep)
+        if bundle != -1:
+            return os.path.normcase(exe[:bundle + 5])
+        home = os.path.normcase(os.path.dirname(exe))
+        if home in cls.SHARED_BIN_DIRS:
+            return None
+        return os.path.join(home, '')
+
+    def _resolve_process_trees(self, app_name):
+        """Collect the processes matching app_name and the descendants that belong to them
 
-        for proc in psutil.process_iter(['name']):
+        A descendant is part of the app if its own name matches, it runs the
+        same executable, or its executable lives in the app's own folder.
+        Anything else (a shell opened in a terminal, a program started from
+        it) is left running. Returns (targets, spared).
+        """
+        own_pids = {os.getpid()}
+        try:
+            own_pids.update(p.pid for p in psutil.Process().parents())
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+
+        targets = {}
+        spared = {}
+        for proc in psutil.process_iter(['name', 'exe']):
             try:
-                proc_name = proc.info['name'].lower()
-                if app_name in proc_name:
-                    proc.terminate()
-                    killed_count += 1
+                proc_name = proc.info['name'] or ''
+                if not proc_name or proc.pid in own_pids or not self._name_matches(proc_name, app_name):
+                    continue
+                targets[proc.pid] = proc
+                exe = proc.info['exe']
+                home = self._app_home(exe)
+                for child in proc.children(recursive=True):
+                    if child.pid in own_pids or child.pid in targets:
+                        continue
+                    try:
+                        child_exe = child.exe()
+                    except (psutil.AccessDenied, psutil.ZombieProcess):
+                        child_exe = None
+                    if self._name_matches(child.name(), app_name) or (exe and child_exe == exe) or \
+                            (home and child_exe and os.path.normcase(child_exe).startswith(home)):
+                        targets[child.pid] = child
+                        spared.pop(child.pid, None)
+                    else:
+                        spared[child.pid] = child
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 continue
 
-        return killed_count
+        return list(targets.values()), list(spared.values())
+
+    def _signal_all(self, procs, kill=False):
+        """Send terminate/kill to every process, returning those that accepted it"""
+        signalled = []
+        for proc in procs:
+            try:
+                if kill:
+                    proc.kill()
+                else:
+                    proc.terminate()
+                signalled.append(proc)
+            except psutil.NoSuchProcess:
+                # Already gone, counts as closed
+                signalled.append(proc)
+            except psutil.AccessDenied:
+                continue
+        return signalled
+
+    def close_app_by_name(self, app_name, timeout=3.0, kill_timeout=1.0):
+        """Close every process tree matching app_name within a bounded deadline
+
+        All matching processes and the children that belong to them are
+        terminated in one pass, then waited on together. Anything still
+        alive after `timeout` seconds is killed and waited on for
+        `kill_timeout` more seconds. Unrelated children are counted in
+        'spared' and left alone.
+        """
+        app_name = app_name.lower().strip()
+        result = {'matched': 0, 'terminated': 0, 'killed': 0, 'denied': 0, 'survived': 0,
+                  'spared': 0}
+        if not app_name:
+            return result
+
+        procs, spared = self._resolve_process_trees(app_name)
+        result['matched'] = len(procs)
+        result['spared'] = len(spared)
+        if not procs:
+            return result
+
+        signalled = self._signal_all(procs)
+        result['denied'] = len(procs) - len(signalled)
+
+        gone, alive = psutil.wait_procs(signalled, timeout=timeout)
+        alive = self._drop_zombies(alive)
+        result['terminated'] = len(signalled) - len(alive)
+
+        if alive:
+            killed = self._signal_all(alive, kill=True)
+            _, still_alive = psutil.wait_procs(killed, timeout=kill_timeout)
+            still_alive = self._drop_zombies(still_alive)
+            result['killed'] = len(killed) - len(still_alive)
+            result['survived'] = len(alive) - result['killed']
+
+        return result
+
+    def _drop_zombies(self, procs):
+        """Exited processes waiting to be reaped by someone else count as closed"""
+        alive = []
+        for proc in procs:
+            try:
+                if proc.status() != psutil.STATUS_ZOMBIE:
+                    alive.append(proc)
+            except psutil.NoSuchProcess:
+                continue
+        return alive
+
+
+class BackgroundScheduler:
+    """Runs resumable background jobs at low priority, backing off under load
+
+    A job is a generator; every `yield` is a checkpoint. Between checkpoints
+    the scheduler checks CPU, disk IO, battery and recent command activity
+    and pauses the job instead of restarting it, so foreground commands never
+    compete with indexing work. A queued job with a higher priority takes
+    over at the next checkpoint; the job it displaced resumes afterwards.
+    """
+
+    def __init__(self, cpu_limit=60.0, io_limit=20 * 1024 * 1024, min_battery=25,
+                 quiet_period=3.0, poll_interval=1.0):
+        self.cpu_limit = cpu_limit          # percent, system-wide
+        self.io_limit = io_limit            # disk bytes per second
+        self.min_battery = min_battery      # percent, when not plugged in
+        self.quiet_period = quiet_period    # seconds of calm after a command
+        self.poll_interval = poll_interval
+
+        self.jobs = []
+        self.stats = {}
+        self.current_job = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._active_commands = 0
+        self._last_activity = 0.0
+        self._last_io = None
+        self._load_reason = None
+        self._load_sampled_at = None
+        self._process = psutil.Process()
+        self._worker = None
+
+    def start(self):
+        """Start the worker thread"""
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, daemon=True)
+            self._worker.start()
+
+    def stop(self):
+        """Stop after the current checkpoint; unfinished jobs are dropped"""
+        self._stopped = True
+        self._wakeup.set()
+
+    def submit(self, name, job, on_start=None, on_done=None, priority=0):
+        """Queue a generator job, optionally with start/finish callbacks"""
+        with self._lock:
+            self.jobs.append((name, job, on_start, on_done, priority))
+            self.stats[name] = {'state': 'queued', 'checkpoints': 0,
+                                'paused_seconds': 0.0, 'pause_reason': None}
+        self._wakeup.set()
+
+    def command_started(self):
+        """Mark a foreground command as running; background work pauses"""
+        with self._lock:
+            self._active_commands += 1
+            self._last_activity = time.monotonic()
+
+    def command_finished(self):
+        with self._lock:
+            self._active_commands = max(0, self._active_commands - 1)
+            self._last_activity = time.monotonic()
+
+    def busy_reason(self):
+        """Return why background work should wait right now, or None"""
+        with self._lock:
+            if self._active_commands:
+                return "command running"
+            if time.monotonic() - self._last_activity < self.quiet_period:
+                return "recent command"
+
+        # Load readings over very short windows are noise, so sample at most
+        # once per poll_interval and reuse the verdict in between
+        now = time.monotonic()
+        if self._load_sampled_at is None or now - self._load_sampled_at >= self.poll_interval:
+            self._load_reason = self._sample_load()
+            self._load_sampled_at = now
+        return self._load_reason
+
+    def _sample_load(self):
+        """Load from everything except this process since the previous sample"""
+        system_cpu = psutil.cpu_percent(interval=None)
+        try:
+            own_cpu = self._process.cpu_percent(interval=None) / (psutil.cpu_count() or 1)
+        except psutil.Error:
+            own_cpu = 0.0
+        if system_cpu - own_cpu > self.cpu_limit:
+            return "high CPU"
+
+        if self._io_rate() > self.io_limit:
+            return "heavy disk IO"
+
+        try:
+            battery = psutil.sensors_battery()
+        except (AttributeError, NotImplementedError, OSError):
+            battery = None
+        if battery and not battery.power_plugged and battery.percent < self.min_battery:
+            return "low battery"
+
+        return None
+
+    def _io_rate(self):
+        """Disk bytes per second from other processes since the previous call"""
+        try:
+            counters = psutil.disk_io_counters()
+        except (RuntimeError, OSError):
+            counters = None
+        if counters is None:
+            return 0.0
+
+        try:
+            own = self._process.io_counters()
+            own_total = own.read_bytes + own.write_bytes
+        except (AttributeError, psutil.Error):
+            # Not available on every platform; count our own IO as foreign
+            own_total = 0
+
+        now = time.monotonic()
+        total = counters.read_bytes + counters.write_bytes
+        previous, self._last_io = self._last_io, (now, total, own_total)
+        if previous is None or now <= previous[0]:
+            return 0.0
+        foreign = (total - previous[1]) - (own_total - previous[2])
+        return max(0.0, foreign) / (now - previous[0])
+
+    def _lower_priority(self):
+        """Drop the worker thread to idle CPU and IO priority where supported
+
+        On Linux nice and ionice apply per thread, so only this worker is
+        affected. Elsewhere they would slow the whole assistant, so they are
+        left alone and the load checks do the throttling.
+        """
+        if platform.system() != "Linux":
+            return
+        tid = threading.get_native_id()
+        try:
+            os.setpriority(os.PRIO_PROCESS, tid, 19)
+        except (AttributeError, OSError):
+            pass
+        try:
+            psutil.Process(tid).ionice(psutil.IOPRIO_CLASS_IDLE)
+        except (AttributeError, psutil.Error, OSError):
+            pass
+
+    def _next_job(self):
+        """Oldest job among those with the highest priority"""
+        with self._lock:
+            if not self.jobs:
+                return None
+            top = max(entry[4] for entry in self.jobs)
+            return self.jobs.pop(next(i for i, entry in enumerate(self.jobs) if entry[4] == top))
+
+    def _outranked(self, priority):
+        with self._lock:
+            return any(entry[4] > priority for entry in self.jobs)
+
+    def _run(self):
+        self._lower_priority()
+        self._sample_load()  # Prime the CPU and IO counters
+        self._load_sampled_at = time.monotonic()
+
+        while not self._stopped:
+            entry = self._next_job()
+            if entry is None:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            name, job, on_start, on_done, priority = entry
+            stats = self.stats[name]
+            self.current_job = name
+            stats['state'] = 'running'
+            self._callback(on_start, name)
+
+            preempted = False
+            try:
+                self._wait_until_idle(stats)
+                for _ in job:
+                    stats['checkpoints'] += 1
+                    self._wait_until_idle(stats)
+                    if self._stopped:
+                        job.close()
+                        return
+                    if self._outranked(priority):
+                        # Park the job at this checkpoint; it resumes from
+                        # here, without a second on_start, once it is next
+                        with self._lock:
+                            self.jobs.insert(0, (name, job, None, on_done, priority))
+                        preempted = True
+                        break
+                stats['state'] = 'queued' if preempted else 'done'
+            except Exception as e:
+                stats['state'] = f'failed: {e}'
+            finally:
+                self.current_job = None
+                stats['pause_reason'] = None
+
+            if not preempted:
+                self._callback(on_done, name)
+
+    def _callback(self, callback, name):
+        """Run a job callback without letting it take down the worker thread"""
+        if callback is None:
+            return
+        try:
+            callback()
+        except Exception as e:
+            print(f"⚠️ Background job {name} callback failed: {e}")
+
+    def _wait_until_idle(self, stats):
+        """Block at a checkpoint while the system is busy"""
+        reason = self.busy_reason()
+        while reason and not self._stopped:
+            stats['state'] = 'paused'
+            stats['pause_reason'] = reason
+            started = time.monotonic()
+            time.sleep(self.poll_interval)
+            stats['paused_seconds'] += time.monotonic() - started
+            reason = self.busy_reason()
+        stats['state'] = 'running'
+        stats['pause_reason'] = None
 
 
 class MemoryManager:
@@ -350,6 +1377,13 @@ class MemoryManager:
                 value TEXT
             )
         ''')
+        # Skills used to report every response as a success; relabel the
+        # failures logged back then so the intent model doesn't learn from them
+        cursor.execute('''
+            UPDATE interactions SET success = 0
+            WHERE success = 1 AND (response LIKE 'Could not %' OR response LIKE 'Error%'
+                                   OR response LIKE '% is not running')
+        ''')
         conn.commit()
         conn.close()
 
@@ -403,36 +1437,482 @@ class MemoryManager:
         conn.commit()
         conn.close()
 
+    def get_training_interactions(self, after_id=0):
+        """Successful (id, command, intent) rows logged after after_id, oldest first"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT id, command, intent FROM interactions
+            WHERE id > ? AND success = 1 AND intent != 'general'
+            ORDER BY id
+        ''', (after_id,))
+        rows = cursor.fetchall()
+        conn.close()
+        return rows
+
+
+class IntentClassifier:
+    """Linear intent model over hashed character n-grams, trained from logged interactions
+
+    Texts become sparse vectors of hashed character 2-4-grams plus whole
+    words; a softmax layer on top gives an intent and a confidence. Weights
+    are swapped in atomically after each update, so the command loop can
+    classify while the background scheduler is training.
+    """
+
+    def __init__(self, n_features=2 ** 14, ngram_range=(2, 4), learning_rate=2.0,
+                 l2=1e-5, min_confidence=0.7, min_samples=20):
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.min_confidence = min_confidence
+        self.min_samples = min_samples
+
+        # (weights, bias, classes), replaced as a whole on every update
+        self._model = (np.zeros((n_features, 0), dtype=np.float32),
+                       np.zeros(0, dtype=np.float32), [])
+        self.samples_seen = 0
+        self.last_trained_id = 0
+        self._hash_cache = {}
+
+    @property
+    def classes(self):
+        return self._model[2]
+
+    @property
+    def is_ready(self):
+        """Only trust the model once it has seen enough examples of several intents"""
+        return len(self.classes) >= 2 and self.samples_seen >= self.min_samples
+
+    def _hashes(self, text):
+        text = text.lower().strip()
+        padded = f" {text} "
+        grams = [f"w:{word}" for word in text.split()]
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+        # crc32 keeps hashes stable across runs; the cache keeps it cheap
+        cache = self._hash_cache
+        if len(cache) > 200000:
+            cache.clear()
+        hashed = set()
+        for gram in grams:
+            index = cache.get(gram)
+            if index is None:
+                index = cache[gram] = zlib.crc32(gram.encode('utf-8')) % self.n_features
+            hashed.add(index)
+        return hashed
+
+    def _featurize(self, texts):
+        """Sparse batch: feature indices, per-entry values and row offsets"""
+        indices = []
+        values = []
+        offsets = [0]
+        for text in texts:
+            hashed = self._hashes(text)
+            indices.extend(hashed)
+            values.append(1.0 / np.sqrt(len(hashed)))
+            offsets.append(len(indices))
+        offsets = np.asarray(offsets, dtype=np.int64)
+        values = np.repeat(np.asarray(values, dtype=np.float32), np.diff(offsets))
+        return np.asarray(indices, dtype=np.int64), values, offsets
+
+    @staticmethod
+    def _scores(model, indices, values, offsets):
+        weights, bias, _ = model
+        contributions = weights[indices] * values[:, None]
+        return np.add.reduceat(contributions, offsets[:-1], axis=0) + bias
+
+    @staticmethod
+    def _softmax(scores):
+        scores = scores - scores.max(axis=1, keepdims=True)
+        exp = np.exp(scores)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict_batch(self, texts):
+        """Return (intents, confidences) for a list of texts"""
+        model = self._model
+        if not texts or not model[2]:
+            return [None] * len(texts), np.zeros(len(texts), dtype=np.float32)
+
+        probs = self._softmax(self._scores(model, *self._featurize(texts)))
+        best = probs.argmax(axis=1)
+        return [model[2][i] for i in best], probs[np.arange(len(texts)), best]
+
+    def predict(self, text):
+        intents, confidences = self.predict_batch([text])
+        return intents[0], float(confidences[0])
+
+    def partial_fit(self, texts, intents, epochs=1, batch_size=32, seed=0):
+        """Update the model with new labelled examples, learning new intents as they appear"""
+        for _ in self.iter_partial_fit(texts, intents, epochs, batch_size, seed):
+            pass
+
+    def iter_partial_fit(self, texts, intents, epochs=1, batch_size=32, seed=0):
+        """partial_fit as a generator that yields after every mini-batch
+
+        Each epoch is a fresh shuffle of all the texts. The updated model is
+        swapped in once, after the last mini-batch.
+        """
+        if not texts:
+            return
+
+        weights, bias, classes = self._model
+        weights = weights.copy()
+        bias = bias.copy()
+        classes = list(classes)
+
+        new_classes = [intent for intent in dict.fromkeys(intents) if intent not in classes]
+        if new_classes:
+            classes.extend(new_classes)
+            weights = np.hstack([weights, np.zeros((self.n_features, len(new_classes)), dtype=np.float32)])
+            bias = np.concatenate([bias, np.zeros(len(new_classes), dtype=np.float32)])
+
+        class_ids = {intent: i for i, intent in enumerate(classes)}
+        labels = np.array([class_ids[intent] for intent in intents])
+        rng = np.random.default_rng(seed)
+
+        for _ in range(epochs):
+            order = rng.permutation(len(texts))
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
+                indices, values, offsets = self._featurize([texts[i] for i in batch])
+                model = (weights, bias, classes)
+                grad = self._softmax(self._scores(model, indices, values, offsets))
+                grad[np.arange(len(batch)), labels[batch]] -= 1.0
+                grad /= len(batch)
+
+                rows = np.repeat(np.arange(len(batch)), np.diff(offsets))
+                if self.l2:
+                    weights[indices] *= (1.0 - self.learning_rate * self.l2)
+                np.add.at(weights, indices, -self.learning_rate * values[:, None] * grad[rows])
+                bias -= self.learning_rate * grad.sum(axis=0)
+                yield
+
+        self._model = (weights, bias, classes)
+        self.samples_seen += len(texts)
+
+    def fit(self, texts, intents, epochs=10):
+        """Train from scratch"""
+        self._model = (np.zeros((self.n_features, 0), dtype=np.float32),
+                       np.zeros(0, dtype=np.float32), [])
+        self.samples_seen = 0
+        self.partial_fit(texts, intents, epochs=epochs)
+
+    def save(self, path):
+        """Write the weights and training progress to an .npz file, replacing it atomically"""
+        weights, bias, classes = self._model
+        temporary = f"{path}.tmp"
+        with open(temporary, 'wb') as f:
+            np.savez(f, weights=weights, bias=bias, classes=np.array(classes, dtype=str),
+                     samples_seen=self.samples_seen, last_trained_id=self.last_trained_id,
+                     n_features=self.n_features, ngram_range=np.array(self.ngram_range))
+        os.replace(temporary, path)
+
+    def load(self, path):
+        """Restore a model written by save(); False if there is none or it has other settings"""
+        if not os.path.exists(path):
+            return False
+        try:
+            with np.load(path) as data:
+                if int(data['n_features']) != self.n_features or \
+                        tuple(data['ngram_range']) != tuple(self.ngram_range):
+                    return False
+                self._model = (data['weights'].astype(np.float32), data['bias'].astype(np.float32),
+                               [str(intent) for intent in data['classes']])
+                self.samples_seen = int(data['samples_seen'])
+                self.last_trained_id = int(data['last_trained_id'])
+        except Exception as e:
+            print(f"⚠️ Could not load intent model from {path}: {e}")
+            return False
+        return True
+
+    def iter_train_from_memory(self, memory, batch_size=32):
+        """Background job: learn from interactions logged since the last run
+
+        The first run makes several passes over the whole shuffled log; later
+        runs only take a single pass over the new rows. Yields after every
+        mini-batch.
+        """
+        rows = memory.get_training_interactions(self.last_trained_id)
+        if not rows:
+            return
+        epochs = 10 if self.samples_seen == 0 else 1
+        yield from self.iter_partial_fit([row[1] for row in rows], [row[2] for row in rows],
+                                         epochs=epochs, batch_size=batch_size)
+        self.last_trained_id = rows[-1][0]
+
+
+def evaluate_intent_classifier(memory, holdout=0.2, seed=0, batch_size=16, repeats=200):
+    """Offline accuracy and latency check of IntentClassifier against the keyword rules
+
+    Successful logged interactions are shuffled and split; the model trains
+    on one part and is scored on the held-out part. Latency is measured for
+    a single command and for a batch of batch_size commands.
+    """
+    rows = memory.get_training_interactions()
+    if len(rows) < 10:
+        return {'error': f"need at least 10 successful interactions, have {len(rows)}"}
+
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(rows))
+    split = max(1, int(len(rows) * holdout))
+    test = [rows[i] for i in order[:split]]
+    train = [rows[i] for i in order[split:]]
+
+    classifier = IntentClassifier()
+    train_start = time.perf_counter()
+    classifier.fit([row[1] for row in train], [row[2] for row in train])
+    train_seconds = time.perf_counter() - train_start
+
+    texts = [row[1] for row in test]
+    expected = [row[2] for row in test]
+    predicted, confidences = classifier.predict_batch(texts)
+
+    keyword_parser = IntentParser()
+    keyword_predicted = [keyword_parser.parse(text)[0] for text in texts]
+    confident = confidences >= classifier.min_confidence
+
+    batch = (texts * (batch_size // len(texts) + 1))[:batch_size]
+    single_start = time.perf_counter()
+    for _ in range(repeats):
+        classifier.predict(texts[0])
+    single_ms = (time.perf_counter() - single_start) / repeats * 1000
+    batch_start = time.perf_counter()
+    for _ in range(repeats):
+        classifier.predict_batch(batch)
+    batch_ms = (time.perf_counter() - batch_start) / repeats * 1000
+
+    return {
+        'train_size': len(train),
+        'test_size': len(test),
+        'classes': len(classifier.classes),
+        'accuracy': float(np.mean([p == e for p, e in zip(predicted, expected)])),
+        'keyword_accuracy': float(np.mean([p == e for p, e in zip(keyword_predicted, expected)])),
+        'confident_fraction': float(confident.mean()),
+        'confident_accuracy': float(np.mean([p == e for p, e, c in zip(predicted, expected, confident) if c]))
+        if confident.any() else 0.0,
+        'train_seconds': train_seconds,
+        'single_ms': single_ms,
+        f'batch{batch_size}_ms': batch_ms,
+    }
+
 
 class IntentParser:
     """Advanced NLP-based intent parsing"""
 
+    # Intent patterns with priority
+    PATTERNS = [
+        ('greeting', ['hello', 'hi', 'hey', 'good morning', 'good evening', 'good afternoon']),
+        ('open_app', ['open', 'launch', 'start', 'run']),
+        ('close_app', ['close', 'quit', 'exit', 'kill', 'stop', 'end']),
+        ('open_file', ['open file', 'show file', 'file', 'document']),
+        ('play_media', ['play', 'play music', 'play video', 'music', 'video', 'song']),
+        ('search_web', ['search', 'google', 'look up', 'find online', 'search for']),
+        ('browse', ['browse', 'website', 'open site', 'go to']),
+        ('system_info', ['system', 'computer info', 'specs', 'hardware']),
+        ('time', ['time', 'what time', 'current time', "what's the time"]),
+        ('date', ['date', 'what date', 'today', "what's today"]),
+        ('help', ['help', 'what can you do', 'commands', 'capabilities']),
+        ('thanks', ['thank', 'thanks', 'appreciate']),
+    ]
+
+    # Intents whose parameter names a thing (app, file, song) rather than free text
+    ENTITY_INTENTS = ('open_app', 'close_app', 'open_file', 'play_media')
+
+    def __init__(self, classifier=None):
+        self.classifier = classifier
+
     def parse(self, text):
-        text = text.lower().strip()
+        return self.parse_many([text])[0]
+
+    def parse_many(self, texts):
+        """parse() for several texts, classifying them in a single batch"""
+        texts = [text.lower().strip() for text in texts]
+        predictions = [None] * len(texts)
+        if texts and self.classifier is not None and self.classifier.is_ready:
+            intents, confidences = self.classifier.predict_batch(texts)
+            predictions = list(zip(intents, confidences.tolist()))
+        return [self._parse(text, prediction) for text, prediction in zip(texts, predictions)]
+
+    def _parse(self, text, prediction):
+        # The command's own verb wins over keywords later in its free text
+        intent, keyword = self._leading_match(text)
+        if intent is None:
+            intent, keyword = self._match(text)
+
+        # A trained classifier overrides the keyword rules only when confident
+        if prediction is not None:
+            predicted, confidence = prediction
+            if confidence >= self.classifier.min_confidence and predicted != intent:
+                intent, keyword = predicted, self._keyword_for(predicted, text)
+
+        # "my latest pdf", "the biggest video": answered from the file attribute indexes
+        if intent in self.FILE_QUERY_INTENTS and self.parse_file_query(text):
+            return 'open_file', text
+
+        if intent == 'general':
+            return 'general', text
+
+        param = text.replace(keyword, '').strip() if keyword else text
+        if intent in self.ENTITY_INTENTS:
+            param = self.extract_entity(param, intent)
+        return intent, param if param else text
+
+    # Words that turn a request into an attribute lookup on the file index
+    FILE_ORDER_WORDS = {
+        'latest': 'latest', 'newest': 'latest', 'recent': 'latest', 'last': 'latest',
+        'oldest': 'oldest', 'earliest': 'oldest',
+        'biggest': 'largest', 'largest': 'largest', 'huge': 'largest',
+        'smallest': 'smallest', 'tiniest': 'smallest',
+    }
+    FILE_TYPE_WORDS = {
+        'pdf': 'application/pdf',
+        'video': 'video', 'movie': 'video', 'clip': 'video',
+        'song': 'audio', 'music': 'audio', 'track': 'audio', 'audio': 'audio', 'recording': 'audio',
+        'photo': 'image', 'picture': 'image', 'image': 'image', 'screenshot': 'image',
+        'document': 'document', 'doc': 'document', 'spreadsheet': 'document',
+        'presentation': 'document', 'text': 'text',
+        'archive': 'archive', 'zip': 'archive',
+    }
+    FILE_PLACE_WORDS = {
+        'downloaded': '~/Downloads', 'downloads': '~/Downloads',
+        'desktop': '~/Desktop', 'documents': '~/Documents',
+        'music': '~/Music', 'videos': '~/Videos', 'pictures': '~/Pictures',
+    }
+    FILE_TIME_WORDS = {'today': 1, 'yesterday': 2, 'week': 7, 'month': 31}
+    FILE_QUERY_INTENTS = ('open_app', 'open_file', 'play_media', 'general')
+
+    @classmethod
+    def parse_file_query(cls, text):
+        """Order, type bucket, folder and time window of an attribute file query, or None
+
+        Only requests with an ordering word ("latest", "biggest", ...) count;
+        everything else keeps going through fuzzy name matching.
+        """
+        words = re.findall(r"[a-z0-9]+", text.lower())
+        order = next((cls.FILE_ORDER_WORDS[w] for w in words if w in cls.FILE_ORDER_WORDS), None)
+        if order is None:
+            return None
 
-        # Intent patterns with priority
-        patterns = [
-            ('greeting', ['hello', 'hi', 'hey', 'good morning', 'good evening', 'good afternoon']),
-            ('open_app', ['open', 'launch', 'start', 'run']),
-            ('close_app', ['close', 'quit', 'exit', 'kill', 'stop', 'end']),
-            ('open_file', ['open file', 'show file', 'file', 'document']),
-            ('play_media', ['play', 'play music', 'play video', 'music', 'video', 'song']),
-            ('search_web', ['search', 'google', 'look up', 'find online', 'search for']),
-            ('browse', ['browse', 'website', 'open site', 'go to']),
-            ('system_info', ['system', 'computer info', 'specs', 'hardware']),
-            ('time', ['time', 'what time', 'current time', "what's the time"]),
-            ('date', ['date', 'what date', 'today', "what's today"]),
-            ('help', ['help', 'what can you do', 'commands', 'capabilities']),
-            ('thanks', ['thank', 'thanks', 'appreciate']),
-        ]
+        query = {'order': order, 'bucket': None, 'under': None, 'since': None}
+        for word in words:
+            singular = word[:-1] if word.endswith('s') and word[:-1] in cls.FILE_TYPE_WORDS else word
+            if query['bucket'] is None and singular in cls.FILE_TYPE_WORDS:
+                query['bucket'] = cls.FILE_TYPE_WORDS[singular]
+            elif word in cls.FILE_PLACE_WORDS and query['under'] is None:
+                # "music"/"video" name a type first and a folder only after "in"/"from"
+                if word not in cls.FILE_TYPE_WORDS or 'in' in words or 'from' in words:
+                    query['under'] = os.path.expanduser(cls.FILE_PLACE_WORDS[word])
+            if word in cls.FILE_TIME_WORDS and query['since'] is None:
+                start_of_today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+                query['since'] = start_of_today.timestamp() - (cls.FILE_TIME_WORDS[word] - 1) * 86400
+
+        # "open last fm" is an app, "open the last file" is not
+        if query['bucket'] is None and query['under'] is None and not {'file', 'files'} & set(words):
+            return None
+        return query
+
+    def _keyword_for(self, intent, text):
+        """The longest keyword of intent that appears in text, if any"""
+        for keywords in (k for i, k in self.PATTERNS if i == intent):
+            found = [keyword for keyword in keywords if keyword in text]
+            if found:
+                return max(found, key=len)
+        return None
 
-        for intent, keywords in patterns:
+    def _match(self, text):
+        """Return the first (intent, keyword) pattern found in text"""
+        for intent, keywords in self.PATTERNS:
             for keyword in keywords:
                 if keyword in text:
-                    param = text.replace(keyword, '').strip()
-                    return intent, param if param else text
+                    return intent, keyword
+        return 'general', None
 
-        return 'general', text
+    def _leading_match(self, text, verbs_only=False):
+        """The (intent, keyword) whose keyword starts text, longest first, or (None, None)"""
+        best = (None, None)
+        for intent, keywords in self.PATTERNS:
+            for keyword in keywords:
+                if verbs_only and keyword not in self.COMMAND_VERBS:
+                    continue
+                if (best[1] is None or len(keyword) > len(best[1])) and \
+                        re.match(re.escape(keyword) + r'(\s|$)', text):
+                    best = (intent, keyword)
+        return best
+
+    def _match_words(self, text):
+        """Like _match, but keywords must appear as whole words ("chips" is not "hi")"""
+        for intent, keywords in self.PATTERNS:
+            for keyword in keywords:
+                if re.search(r'\b' + re.escape(keyword) + r'\b', text):
+                    return intent, keyword
+        return 'general', None
+
+    # Separators that may join independent commands in one utterance
+    SPLIT_PATTERN = re.compile(r'\s*(,|;|\band then\b|\bthen\b|\band\b)\s*')
+
+    # Intents whose target can be listed ("open firefox and chrome")
+    LISTABLE_INTENTS = ('open_app', 'close_app')
+
+    # Intents taking free text that may itself contain "and" ("search for rock and roll")
+    FREE_TEXT_INTENTS = ('search_web', 'browse')
+
+    # Keywords that start a new command even in the middle of free text
+    COMMAND_VERBS = ('open', 'launch', 'start', 'run', 'close', 'quit', 'exit', 'kill', 'stop',
+                     'play', 'search', 'search for', 'google', 'look up', 'browse', 'go to',
+                     'what time', "what's the time", 'what date', "what's today")
+
+    # Words that make a fragment a phrase rather than the name of an app
+    NOT_NAME_WORDS = {'i', 'me', 'my', 'you', 'we', 'it', 'is', 'are', 'be', 'do',
+                      'to', 'how', 'why', 'what', 'when', 'better'}
+
+    def split_commands(self, text):
+        """Split a compound utterance into independent sub-commands
+
+        A fragment only becomes its own command if it carries an intent,
+        so "search for salt and pepper" stays whole. After a search or
+        browse, only a fragment starting with a command verb splits off
+        ("search for rock and roll music" stays whole). A bare name after
+        an open/close ("open firefox and chrome") reuses the previous verb.
+        """
+        pieces = self.SPLIT_PATTERN.split(text.strip())
+        fragments = pieces[0::2]
+        separators = pieces[1::2]
+
+        commands = []
+        last_intent = None
+        last_verb = None
+        for i, fragment in enumerate(fragments):
+            fragment = fragment.strip()
+            if not fragment:
+                continue
+            lowered = fragment.lower()
+            if commands and last_intent in self.FREE_TEXT_INTENTS:
+                intent, keyword = self._leading_match(lowered, verbs_only=True)
+                intent = intent or 'general'
+            else:
+                intent, keyword = self._leading_match(lowered)
+                if intent is None:
+                    intent, keyword = self._match_words(lowered)
+
+            if intent != 'general' or not commands:
+                commands.append(fragment)
+                last_intent = intent
+                last_verb = keyword
+            elif last_intent in self.LISTABLE_INTENTS and self._is_bare_name(lowered):
+                commands.append(f"{last_verb} {fragment}")
+            else:
+                commands[-1] = f"{commands[-1]} {separators[i - 1]} {fragment}"
+
+        return commands or [text]
+
+    def _is_bare_name(self, text):
+        """Short fragment that reads like an app name ("chrome", "visual studio code")"""
+        words = text.split()
+        return 0 < len(words) <= 3 and not self.NOT_NAME_WORDS & set(words)
 
     def extract_entity(self, text, intent):
         """Extract the main entity (app name, file name, etc.)"""
@@ -444,73 +1924,135 @@ class IntentParser:
 
 
 class SkillRouter:
-    """Routes commands to system-level actions"""
+    """Routes commands to system-level actions
+
+    Every skill is a coroutine run on the command loop and returns
+    (response, success). Blocking work (psutil scans, filesystem walks,
+    SQLite, webbrowser) is offloaded to worker threads so one slow skill
+    never stalls the others.
+    """
 
     def __init__(self, scanner, process_mgr, memory):
         self.scanner = scanner
         self.process_mgr = process_mgr
         self.memory = memory
         self.system = platform.system()
-
-    def open_app(self, app_query):
+        self._launched = set()
+
+    async def _launch(self, *args):
+        """Start a detached program without blocking the loop"""
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        self._reap(proc)
+
+    async def _launch_shell(self, command):
+        proc = await asyncio.create_subprocess_shell(
+            command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        self._reap(proc)
+
+    def _reap(self, proc):
+        """Wait for a launched program in the background so it never lingers as a zombie"""
+        task = asyncio.get_running_loop().create_task(proc.wait())
+        self._launched.add(task)
+        task.add_done_callback(self._launched.discard)
+
+    async def open_app(self, app_query):
         """Open app using intelligent detection"""
         # First check if already running
-        running = self.process_mgr.is_app_running(app_query)
+        running = await asyncio.to_thread(self.process_mgr.is_app_running, app_query)
         if running:
-            return f"{app_query} is already running"
+            return f"{app_query} is already running", True
 
         # Find app in system scan
-        app = self.scanner.find_app(app_query)
+        app = await asyncio.to_thread(self.scanner.find_app, app_query)
 
         if app:
             try:
                 if self.system == "Windows":
                     if app['path'].endswith('.lnk'):
-                        os.startfile(app['path'])
+                        await asyncio.to_thread(os.startfile, app['path'])
                     else:
-                        subprocess.Popen(app['path'], shell=True)
+                        await self._launch_shell(app['path'])
                 elif self.system == "Darwin":
-                    subprocess.Popen(['open', '-a', app['name']])
+                    await self._launch('open', '-a', app['name'])
                 else:
-                    subprocess.Popen([app['path']])
+                    await self._launch(app['path'])
 
-                self.memory.update_app_usage(app['name'], True)
-                return f"Opening {app['name']}"
+                await asyncio.to_thread(self.memory.update_app_usage, app['name'], True)
+                return f"Opening {app['name']}", True
             except Exception as e:
-                self.memory.update_app_usage(app['name'], False)
-                return f"Error opening {app['name']}: {str(e)}"
+                await asyncio.to_thread(self.memory.update_app_usage, app['name'], False)
+                return f"Error opening {app['name']}: {str(e)}", False
         else:
-            return f"Could not find application: {app_query}"
+            return f"Could not find application: {app_query}", False
 
-    def close_app(self, app_query):
+    async def close_app(self, app_query):
         """Close app intelligently"""
-        count = self.process_mgr.close_app_by_name(app_query)
-        if count > 0:
-            return f"Closed {count} instance(s) of {app_query}"
-        else:
-            return f"{app_query} is not running"
-
-    def open_file(self, file_query):
+        result = await asyncio.to_thread(self.process_mgr.close_app_by_name, app_query)
+        closed = result['terminated'] + result['killed']
+
+        if result['matched'] == 0:
+            return f"{app_query} is not running", False
+        if closed == 0:
+            return f"Could not close {app_query} (permission denied)", False
+
+        response = f"Closed {closed} process(es) of {app_query}"
+        if result['killed']:
+            response += f", {result['killed']} had to be force-killed"
+        stuck = result['survived'] + result['denied']
+        if stuck:
+            response += f", {stuck} could not be closed"
+        if result['spared']:
+            response += f", left {result['spared']} unrelated child process(es) running"
+        return response, True
+
+    async def open_file(self, file_query):
         """Open file using intelligent search"""
-        file_info = self.scanner.find_file(file_query)
+        attributes = IntentParser.parse_file_query(file_query)
+        if attributes:
+            matches = await asyncio.to_thread(self.scanner.query_files, **attributes)
+            if not matches:
+                return f"Could not find a file matching: {file_query}", False
+            return await self._open_path(matches[0]['path'], matches[0]['name'])
+
+        file_info = await asyncio.to_thread(self.scanner.find_file, file_query)
 
         if file_info:
-            try:
-                if self.system == "Windows":
-                    os.startfile(file_info['path'])
-                elif self.system == "Darwin":
-                    subprocess.Popen(['open', file_info['path']])
-                else:
-                    subprocess.Popen(['xdg-open', file_info['path']])
-                return f"Opening {file_info['name']}"
-            except Exception as e:
-                return f"Error opening file: {str(e)}"
+            return await self._open_path(file_info['path'], file_info['name'])
         else:
-            return f"Could not find file: {file_query}"
+            return f"Could not find file: {file_query}", False
 
-    def play_media(self, query):
+    async def _open_path(self, path, name):
+        """Open a path with the platform's default handler"""
+        try:
+            if self.system == "Windows":
+                await asyncio.to_thread(os.startfile, path)
+            elif self.system == "Darwin":
+                await self._launch('open', path)
+            else:
+                await self._launch('xdg-open', path)
+            return f"Opening {name}", True
+        except Exception as e:
+            return f"Error opening file: {str(e)}", False
+
+    async def play_media(self, query):
         """Play media file"""
-        # Search in media folders
+        full_path = await asyncio.to_thread(self._find_media, query)
+        if full_path:
+            return await self._open_path(full_path, os.path.basename(full_path))
+        return f"Could not find media: {query}", False
+
+    def _find_media(self, query):
+        """Search media folders for a file whose name contains query"""
         media_dirs = [
             os.path.expanduser('~/Music'),
             os.path.expanduser('~/Videos')
@@ -521,96 +2063,196 @@ class SkillRouter:
                 for root, dirs, files in os.walk(directory):
                     for file in files:
                         if query.lower() in file.lower():
-                            full_path = os.path.join(root, file)
-                            return self.open_file(full_path)
-
-        return f"Could not find media: {query}"
+                            return os.path.join(root, file)
+        return None
 
-    def search_web(self, query):
+    async def search_web(self, query):
         """Search web"""
         try:
             url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
-            webbrowser.open(url)
-            return f"Searching for: {query}"
+            await asyncio.to_thread(webbrowser.open, url)
+            return f"Searching for: {query}", True
         except Exception as e:
-            return f"Error: {str(e)}"
+            return f"Error: {str(e)}", False
 
-    def browse_website(self, url):
+    async def browse_website(self, url):
         """Open website"""
         try:
             if not url.startswith('http'):
                 url = 'https://' + url
-            webbrowser.open(url)
-            return f"Opening {url}"
+            await asyncio.to_thread(webbrowser.open, url)
+            return f"Opening {url}", True
         except Exception as e:
-            return f"Error: {str(e)}"
+            return f"Error: {str(e)}", False
 
-    def get_system_info(self):
+    async def get_system_info(self):
         """Get system info"""
+        return await asyncio.to_thread(self._system_info), True
+
+    def _system_info(self):
         info = f"System: {platform.system()} {platform.release()}\n"
         info += f"CPU: {platform.processor()}\n"
         info += f"Cores: {psutil.cpu_count()}\n"
         info += f"RAM: {psutil.virtual_memory().total / (1024**3):.2f} GB"
         return info
 
-    def get_time(self):
-        return datetime.now().strftime("It's %I:%M %p")
+    async def get_time(self):
+        return datetime.now().strftime("It's %I:%M %p"), True
+
+    async def get_date(self):
+        return datetime.now().strftime("Today is %A, %B %d, %Y"), True
 
-    def get_date(self):
-        return datetime.now().strftime("Today is %A, %B %d, %Y")
+
+class CommandLoop:
+    """Runs the asyncio command core on its own thread
+
+    Other threads (the GUI, the voice listener, batch runs) hand coroutines
+    over with submit(); results come back as concurrent.futures.Future.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro):
+        """Schedule a coroutine on the loop from any thread"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro):
+        """Run a coroutine on the loop and block until it finishes"""
+        return self.submit(coro).result()
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
 
 
 class AGPAssistant:
     """Main AI Assistant"""
 
-    def __init__(self, gui):
+    def __init__(self, gui, headless=False):
         self.gui = gui
-
-    def is_online(self):
-        """Checks for an active internet connection."""
-        try:
-            requests.get("https://www.google.com", timeout=3)
-            return True
-        except requests.ConnectionError:
-            return False
+        self.headless = headless
 
         # Initialize core systems
         print("🚀 Initializing AGP System...")
         self.scanner = SystemScanner()
         self.process_mgr = ProcessManager()
         self.memory = MemoryManager()
-        self.parser = IntentParser()
+        self.classifier = IntentClassifier()
+        self.classifier.load(self.INTENT_MODEL_PATH)
+        self.parser = IntentParser(self.classifier)
         self.skills = SkillRouter(self.scanner, self.process_mgr, self.memory)
 
-        # TTS Engine
-        self.tts_engine = pyttsx3.init()
-        self.tts_engine.setProperty('rate', 180)
+        # Command core runs on its own asyncio loop
+        self.commands = CommandLoop()
+        self.commands.start()
+
+        # Headless runs (batch mode) have no speaker or microphone to set up
+        self.tts_engine = None
+        self.tts_executor = ThreadPoolExecutor(max_workers=1)
+        self.recognizer = None
+        self.microphone = None
+        if not headless:
+            # TTS Engine, created and driven on the single TTS thread since
+            # it is not thread-safe
+            self.tts_engine = self.tts_executor.submit(self._init_tts).result()
+
+            # Speech recognizer
+            self.recognizer = sr.Recognizer()
+            self.microphone = sr.Microphone()
+
+        self.scheduler = BackgroundScheduler()
+
+        # Intent model learns from the interaction log in the background,
+        # ahead of (and interrupting) file indexing
+        self._logged_since_training = 0
+        self.scheduler.submit('intent_training', self._train_intents(), priority=self.TRAINING_PRIORITY)
+
+        if not headless:
+            # Background file indexing, throttled around foreground commands
+            self.scheduler.submit('file_index', self._background_file_index(),
+                                  on_done=lambda: self._ui(self.gui.update_status,
+                                                           f"Ready ({self.scanner.index_summary()})"))
+        self.scheduler.start()
+
+        print("✅ AGP System Ready!")
 
-        # Speech recognizer
-        self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+    # Upper bound for any single skill, in seconds
+    SKILL_TIMEOUT = 10.0
 
-        # Background file indexing
-        threading.Thread(target=self._background_file_index, daemon=True).start()
+    # Logged interactions between incremental intent model updates
+    RETRAIN_EVERY = 20
 
-        print("✅ AGP System Ready!")
+    # Training is short and makes commands smarter, so it outranks indexing
+    TRAINING_PRIORITY = 1
+
+    # Trained intent weights, kept next to the interaction log
+    INTENT_MODEL_PATH = "agp_intent_model.npz"
+
+    def _ui(self, fn, *args):
+        """Hand a GUI method to the GUI thread; never blocks, safe from any thread"""
+        self.gui.post(fn, *args)
+
+    def is_online(self):
+        """Checks for an active internet connection."""
+        try:
+            requests.get("https://www.google.com", timeout=3)
+            return True
+        except requests.ConnectionError:
+            return False
 
     def _background_file_index(self):
-        """Index files in background"""
-        time.sleep(5)  # Wait for startup
-        self.gui.update_status("Indexing files...")
-        self.scanner.index_user_files()
-        self.gui.update_status("Ready")
+        """Index files in background, checkpointing as the walk goes"""
+        start = time.monotonic()
+        while time.monotonic() - start < 5:  # Wait for startup
+            yield
+            time.sleep(0.5)
+        # Only now is the GUI up and past its own "Ready" status
+        self._ui(self.gui.update_status, "Indexing files...")
+        yield from self.iter_index_files()
+
+    def index_files(self):
+        """Index files right away on the calling thread"""
+        for _ in self.iter_index_files():
+            pass
+
+    def iter_index_files(self):
+        """Index the configured roots with the configured rules"""
+        roots = self.memory.get_user_preference('index_roots')
+        rules = self.memory.get_user_preference('index_rules')
+        yield from self.scanner.iter_index_user_files(
+            json.loads(roots) if roots else None,
+            IndexRules.from_dict(json.loads(rules)) if rules else None,
+        )
+
+    def _init_tts(self):
+        engine = pyttsx3.init()
+        engine.setProperty('rate', 180)
+        return engine
 
     def speak(self, text):
         """Text to speech"""
-        self.gui.add_response(f"🗣️ {text}")
+        self._ui(self.gui.add_response, f"🗣️ {text}")
+        if self.tts_engine is None:
+            return
         try:
             self.tts_engine.say(text)
             self.tts_engine.runAndWait()
         except:
             pass
 
+    async def speak_async(self, text):
+        """Speak without blocking the command loop"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.tts_executor, self.speak, text)
+
     def listen(self):
         """Listen to microphone and use the appropriate speech recognition engine."""
         if self.is_online():
@@ -622,11 +2264,11 @@ class AGPAssistant:
         """Listen to microphone and use Google Speech Recognition."""
         try:
             with self.microphone as source:
-                self.gui.update_status("Listening (Online)...")
+                self._ui(self.gui.update_status, "Listening (Online)...")
                 self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
                 audio = self.recognizer.listen(source, timeout=5)
 
-            self.gui.update_status("Processing...")
+            self._ui(self.gui.update_status, "Processing...")
             text = self.recognizer.recognize_google(audio, language='en-US')
             return text
         except sr.WaitTimeoutError:
@@ -634,14 +2276,16 @@ class AGPAssistant:
         except sr.UnknownValueError:
             return None
         except Exception as e:
-            self.gui.add_response(f"❌ Online Recognition Error: {str(e)}")
+            self._ui(self.gui.add_response, f"❌ Online Recognition Error: {str(e)}")
             return None
 
     def listen_offline(self):
         """Listen to microphone and use VOSK for offline speech recognition."""
+        import vosk
+        import sounddevice as sd
         model_path = "models/vosk-model-en-us-0.22-lgraph"
         if not os.path.exists(model_path):
-            self.gui.add_response("❌ Offline model not found.")
+            self._ui(self.gui.add_response, "❌ Offline model not found.")
             return None
 
         try:
@@ -656,7 +2300,7 @@ class AGPAssistant:
 
             with sd.RawInputStream(samplerate=samplerate, blocksize=8000, device=None, dtype='int16',
                                     channels=1, callback=callback):
-                self.gui.update_status("Listening (Offline)...")
+                self._ui(self.gui.update_status, "Listening (Offline)...")
                 rec = vosk.KaldiRecognizer(model, samplerate)
                 # This loop will block, so it needs to be handled carefully in a thread.
                 # For now, we'll listen for a single utterance.
@@ -673,59 +2317,191 @@ class AGPAssistant:
                     # This implementation is still naive and will block indefinitely.
                     # A timeout mechanism would be needed for a robust solution.
         except Exception as e:
-            self.gui.add_response(f"❌ Offline Recognition Error: {str(e)}")
+            self._ui(self.gui.add_response, f"❌ Offline Recognition Error: {str(e)}")
             return None
 
     def process_command(self, command):
-        """Process user command"""
-        self.gui.add_command(command)
-        self.gui.update_status("Thinking...")
+        """Process user command; safe to call from any thread, returns a Future"""
+        future = self.commands.submit(self.handle_command(command))
+        future.add_done_callback(self._command_done)
+        return future
+
+    def _command_done(self, future):
+        """Surface errors that escaped handle_command and reset the status"""
+        if future.cancelled():
+            self._ui(self.gui.update_status, "Ready")
+            return
+        error = future.exception()
+        if error is not None:
+            print(f"❌ Command failed: {error!r}")
+            self._ui(self.gui.add_response, f"❌ Error: {error}")
+            self._ui(self.gui.update_status, "Ready")
+
+    async def handle_command(self, command):
+        self.scheduler.command_started()
+        try:
+            await self._handle_command(command)
+        finally:
+            self.scheduler.command_finished()
+
+    async def _handle_command(self, command):
+        self._ui(self.gui.add_command, command)
+        self._ui(self.gui.update_status, "Thinking...")
+
+        results = await self.execute(command)
+
+        # Log each sub-command on its own so intents stay one-per-row
+        await asyncio.to_thread(self._log_results, results)
 
-        # Parse intent
-        intent, param = self.parser.parse(command)
+        # Respond
+        await self.speak_async("\n".join(result[2] for result in results))
+        self._ui(self.gui.update_status, "Ready")
+
+    def _log_results(self, results):
+        for sub_command, intent, response, success in results:
+            self.memory.log_interaction(sub_command, intent, response, success)
+
+        self._logged_since_training += len(results)
+        if self._logged_since_training >= self.RETRAIN_EVERY:
+            self._logged_since_training = 0
+            self.scheduler.submit('intent_training', self._train_intents(), priority=self.TRAINING_PRIORITY)
+
+    def _train_intents(self):
+        """Background job: update the intent model, then save it for the next session"""
+        trained_id = self.classifier.last_trained_id
+        yield from self.classifier.iter_train_from_memory(self.memory)
+        if self.classifier.last_trained_id != trained_id:
+            try:
+                self.classifier.save(self.INTENT_MODEL_PATH)
+            except OSError as e:
+                print(f"⚠️ Could not save intent model: {e}")
+
+    async def execute(self, command):
+        """Run every sub-command of an utterance, returning results in order
+
+        Sub-commands that touch the same resource (the same app, the media
+        player, the browser) run one after another in their original order;
+        everything else runs concurrently.
+        """
+        subs = self.parser.split_commands(command)
+        parsed = [(sub, *result) for sub, result in zip(subs, self.parser.parse_many(subs))]
+
+        lanes = {}
+        for index, (sub, intent, param) in enumerate(parsed):
+            key = self._conflict_key(intent, param) or ('solo', index)
+            lanes.setdefault(key, []).append(index)
+
+        async def run_lane(indexes):
+            return [(i, *await self._dispatch(*parsed[i][1:])) for i in indexes]
+
+        results = [None] * len(parsed)
+        for lane in await asyncio.gather(*(run_lane(indexes) for indexes in lanes.values())):
+            for index, response, success in lane:
+                sub, intent, _ = parsed[index]
+                results[index] = (sub, intent, response, success)
+        return results
+
+    def _conflict_key(self, intent, param):
+        """Resource a sub-command acts on, or None if it is safe to run alongside anything"""
+        if intent in ('open_app', 'close_app'):
+            return ('app', param)
+        if intent in ('open_file', 'play_media'):
+            return ('player',)
+        if intent in ('search_web', 'browse'):
+            return ('browser',)
+        return None
 
-        # Route to appropriate skill
+    async def _dispatch(self, intent, param):
+        """Route a single intent to its skill, returning (response, success)"""
         response = ""
         success = True
+        skill = None
+
+        if intent == 'greeting':
+            response = "Hello! How can I assist you today?"
+        elif intent == 'open_app':
+            skill = self.skills.open_app(param)
+        elif intent == 'close_app':
+            skill = self.skills.close_app(param)
+        elif intent == 'open_file':
+            skill = self.skills.open_file(param)
+        elif intent == 'play_media':
+            skill = self.skills.play_media(param)
+        elif intent == 'search_web':
+            skill = self.skills.search_web(param)
+        elif intent == 'browse':
+            skill = self.skills.browse_website(param)
+        elif intent == 'system_info':
+            skill = self.skills.get_system_info()
+        elif intent == 'time':
+            skill = self.skills.get_time()
+        elif intent == 'date':
+            skill = self.skills.get_date()
+        elif intent == 'help':
+            response = self._get_help_text()
+        elif intent == 'thanks':
+            response = "You're welcome!"
+        else:
+            response = "I'm not sure how to help with that."
+            success = False
 
-        try:
-            if intent == 'greeting':
-                response = "Hello! How can I assist you today?"
-            elif intent == 'open_app':
-                response = self.skills.open_app(param)
-            elif intent == 'close_app':
-                response = self.skills.close_app(param)
-            elif intent == 'open_file':
-                response = self.skills.open_file(param)
-            elif intent == 'play_media':
-                response = self.skills.play_media(param)
-            elif intent == 'search_web':
-                response = self.skills.search_web(param)
-            elif intent == 'browse':
-                response = self.skills.browse_website(param)
-            elif intent == 'system_info':
-                response = self.skills.get_system_info()
-            elif intent == 'time':
-                response = self.skills.get_time()
-            elif intent == 'date':
-                response = self.skills.get_date()
-            elif intent == 'help':
-                response = self._get_help_text()
-            elif intent == 'thanks':
-                response = "You're welcome!"
-            else:
-                response = "I'm not sure how to help with that."
+        if skill is not None:
+            try:
+                response, success = await asyncio.wait_for(skill, self.SKILL_TIMEOUT)
+            except asyncio.TimeoutError:
+                response = f"Sorry, that took too long ({intent.replace('_', ' ')})"
+                success = False
+            except Exception as e:
+                response = f"Error: {str(e)}"
                 success = False
-        except Exception as e:
-            response = f"Error: {str(e)}"
-            success = False
 
-        # Log interaction
-        self.memory.log_interaction(command, intent, response, success)
+        return response, success
 
-        # Respond
-        self.speak(response)
-        self.gui.update_status("Ready")
+    async def run_batch(self, path):
+        """Run every command in a file (one per line, # for comments) and report throughput"""
+        with open(path, encoding='utf-8') as f:
+            commands = [line.strip() for line in f
+                        if line.strip() and not line.lstrip().startswith('#')]
+
+        latencies = []
+        sub_commands = 0
+        failures = 0
+        started = time.perf_counter()
+
+        for command in commands:
+            self.scheduler.command_started()
+            command_start = time.perf_counter()
+            try:
+                results = await self.execute(command)
+            finally:
+                self.scheduler.command_finished()
+            latencies.append(time.perf_counter() - command_start)
+
+            await asyncio.to_thread(self._log_results, results)
+            for sub_command, intent, response, success in results:
+                self._ui(self.gui.add_response, f"{sub_command} -> {response}")
+                sub_commands += 1
+                failures += 0 if success else 1
+
+        elapsed = time.perf_counter() - started
+        latencies.sort()
+        report = {
+            'commands': len(commands),
+            'sub_commands': sub_commands,
+            'failures': failures,
+            'elapsed': elapsed,
+            'commands_per_sec': len(commands) / elapsed if elapsed else 0.0,
+            'mean_latency': sum(latencies) / len(latencies) if latencies else 0.0,
+            'p95_latency': latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+        }
+        self._ui(
+            self.gui.add_response,
+            f"Batch: {report['commands']} commands ({report['sub_commands']} actions, "
+            f"{report['failures']} failed) in {elapsed:.2f}s, "
+            f"{report['commands_per_sec']:.1f} commands/s, "
+            f"p95 {report['p95_latency'] * 1000:.0f} ms"
+        )
+        return report
 
     def _get_help_text(self):
         return ("I can open and close applications, play music and videos, "
@@ -742,6 +2518,10 @@ class AGPInterface(ctk.CTk):
         self.title("AGP System - Nora")
         self.geometry("800x600")
 
+        # Updates from worker threads wait here for the Tk main loop
+        self._ui_queue = queue.Queue()
+        self.after(self.UI_POLL_MS, self._drain_ui_queue)
+
         # Main container
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(1, weight=1)
@@ -788,6 +2568,25 @@ class AGPInterface(ctk.CTk):
         # Initial greeting
         self.add_response("🌌 AGP System initialized. How can I help you?")
 
+    # How often queued updates from worker threads are applied, in ms
+    UI_POLL_MS = 50
+
+    def post(self, fn, *args):
+        """Queue a GUI call from any thread; the Tk main loop applies it"""
+        self._ui_queue.put((fn, args))
+
+    def _drain_ui_queue(self):
+        while True:
+            try:
+                fn, args = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"⚠️ GUI update failed: {e}")
+        self.after(self.UI_POLL_MS, self._drain_ui_queue)
+
     def update_status(self, status):
         self.status_label.configure(text=f"Status: {status}")
 
@@ -809,8 +2608,7 @@ class AGPInterface(ctk.CTk):
         command = self.input_entry.get().strip()
         if command:
             self.input_entry.delete(0, 'end')
-            threading.Thread(target=self.assistant.process_command,
-                           args=(command,), daemon=True).start()
+            self.assistant.process_command(command)
 
     def on_voice_command(self):
         def listen_thread():
@@ -818,11 +2616,49 @@ class AGPInterface(ctk.CTk):
             if text:
                 self.assistant.process_command(text)
             else:
-                self.update_status("No speech detected")
+                self.post(self.update_status, "No speech detected")
 
         threading.Thread(target=listen_thread, daemon=True).start()
 
 
+class ConsoleInterface:
+    """Headless stand-in for the GUI, used by batch runs"""
+
+    def post(self, func, *args):
+        func(*args)
+
+    def update_status(self, status):
+        pass
+
+    def add_command(self, text):
+        print(f"👤 You: {text}")
+
+    def add_response(self, text):
+        print(text)
+
+
 if __name__ == "__main__":
-    app = AGPInterface()
-    app.mainloop()
+    arg_parser = argparse.ArgumentParser(description="AGP System / Nora desktop assistant")
+    arg_parser.add_argument('--batch', metavar='FILE',
+                            help="run the commands in FILE (one per line) and report throughput")
+    arg_parser.add_argument('--eval-intents', action='store_true',
+                            help="evaluate the intent classifier on the interaction log and exit")
+    arg_parser.add_argument('--eval-phonetic', action='store_true',
+                            help="evaluate phonetic app matching on the misrecognition corpus and exit")
+    args = arg_parser.parse_args()
+
+    if args.eval_phonetic:
+        for name, value in evaluate_phonetic_matching().items():
+            print(f"{name}: {value:.4f}" if isinstance(value, float) else f"{name}: {value}")
+    elif args.eval_intents:
+        for name, value in evaluate_intent_classifier(MemoryManager()).items():
+            print(f"{name}: {value:.4f}" if isinstance(value, float) else f"{name}: {value}")
+    elif args.batch:
+        assistant = AGPAssistant(ConsoleInterface(), headless=True)
+        # Index up front so file commands see a complete index and timing excludes it
+        print("🔍 Indexing files...")
+        assistant.index_files()
+        assistant.commands.run(assistant.run_batch(args.batch))
+    else:
+        app = AGPInterface()
+        app.mainloop()
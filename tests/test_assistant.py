@@ -0,0 +1,205 @@
+import asyncio
+import queue
+import threading
+import time
+
+import pytest
+
+from main import AGPAssistant, AGPInterface, CommandLoop, IntentParser
+
+
+class QueuedGui:
+    """Only the queue half of AGPInterface, so no display is needed"""
+
+    post = AGPInterface.post
+    _drain_ui_queue = AGPInterface._drain_ui_queue
+    UI_POLL_MS = AGPInterface.UI_POLL_MS
+
+    def __init__(self):
+        self._ui_queue = queue.Queue()
+        self.scheduled = []
+        self.statuses = []
+
+    def after(self, ms, func, *args):
+        self.scheduled.append((ms, func))
+
+    def update_status(self, status):
+        self.statuses.append((status, threading.current_thread()))
+
+
+def test_ui_updates_wait_for_the_gui_thread():
+    gui = QueuedGui()
+    assistant = AGPAssistant.__new__(AGPAssistant)
+    assistant.gui = gui
+
+    worker = threading.Thread(target=assistant._ui, args=(gui.update_status, "Thinking..."))
+    worker.start()
+    worker.join()
+    assert gui.statuses == []
+
+    gui._drain_ui_queue()
+    assert gui.statuses == [("Thinking...", threading.current_thread())]
+    assert gui.scheduled == [(AGPInterface.UI_POLL_MS, gui._drain_ui_queue)]
+
+
+def test_failing_update_does_not_stop_the_drain():
+    gui = QueuedGui()
+    gui.post(lambda: 1 / 0)
+    gui.post(gui.update_status, "Ready")
+
+    gui._drain_ui_queue()
+    assert [status for status, _ in gui.statuses] == ["Ready"]
+    assert len(gui.scheduled) == 1
+
+
+class RecordingGui:
+    def __init__(self):
+        self.events = []
+
+    def post(self, func, *args):
+        func(*args)
+
+    def update_status(self, status):
+        self.events.append(('status', status))
+
+    def add_command(self, text):
+        self.events.append(('command', text))
+
+    def add_response(self, text):
+        self.events.append(('response', text))
+
+
+class SchedulerStub:
+    def command_started(self):
+        pass
+
+    def command_finished(self):
+        pass
+
+
+class SkillsStub:
+    """Skills that record their calls; individual tests swap in slow ones"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def open_app(self, name):
+        self.calls.append(('open', name))
+        return f"Opening {name}", True
+
+    async def close_app(self, name):
+        self.calls.append(('close', name))
+        return f"Closed {name}", True
+
+    async def get_time(self):
+        return "It's noon", True
+
+
+def assistant_with(skills, loop):
+    assistant = AGPAssistant.__new__(AGPAssistant)
+    assistant.gui = RecordingGui()
+    assistant.commands = loop
+    assistant.parser = IntentParser()
+    assistant.skills = skills
+    assistant.scheduler = SchedulerStub()
+    return assistant
+
+
+@pytest.fixture
+def loop():
+    commands = CommandLoop()
+    commands.start()
+    yield commands
+    commands.stop()
+
+
+def test_command_loop_runs_coroutines_from_other_threads(loop):
+    async def where():
+        await asyncio.sleep(0)
+        return threading.current_thread()
+
+    assert loop.run(where()) is loop._thread
+    future = loop.submit(where())
+    assert future.result(timeout=1) is loop._thread
+
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        loop.run(fail())
+
+
+def test_slow_skill_times_out(loop):
+    skills = SkillsStub()
+
+    async def hang(name):
+        await asyncio.sleep(5)
+
+    skills.open_app = hang
+    assistant = assistant_with(skills, loop)
+    assistant.SKILL_TIMEOUT = 0.05
+
+    started = time.monotonic()
+    assert loop.run(assistant._dispatch('open_app', 'firefox')) == (
+        "Sorry, that took too long (open app)", False)
+    assert time.monotonic() - started < 1
+
+
+def test_failed_command_is_reported_and_status_reset(loop):
+    assistant = assistant_with(SkillsStub(), loop)
+
+    async def broken(command):
+        raise RuntimeError("parser exploded")
+
+    assistant.execute = broken
+    future = assistant.process_command("open firefox")
+    with pytest.raises(RuntimeError):
+        future.result(timeout=1)
+    # Done-callbacks run just after the result is set
+    expected = [('response', "❌ Error: parser exploded"), ('status', "Ready")]
+    deadline = time.monotonic() + 1
+    while assistant.gui.events[-2:] != expected and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert assistant.gui.events[-2:] == expected
+
+
+def test_independent_sub_commands_run_concurrently(loop):
+    skills = SkillsStub()
+    closed = asyncio.Event()
+
+    async def open_after_close(name):
+        # Only completes if close_app runs while this is waiting
+        await closed.wait()
+        return f"Opening {name}", True
+
+    async def close(name):
+        closed.set()
+        return f"Closed {name}", True
+
+    skills.open_app = open_after_close
+    skills.close_app = close
+    assistant = assistant_with(skills, loop)
+    assistant.SKILL_TIMEOUT = 1.0
+
+    results = loop.run(assistant.execute("open firefox and close spotify and what time is it"))
+    assert results == [
+        ("open firefox", 'open_app', "Opening firefox", True),
+        ("close spotify", 'close_app', "Closed spotify", True),
+        ("what time is it", 'time', "It's noon", True),
+    ]
+
+
+def test_sub_commands_on_the_same_app_keep_their_order(loop):
+    skills = SkillsStub()
+
+    async def slow_open(name):
+        await asyncio.sleep(0.05)
+        skills.calls.append(('open', name))
+        return f"Opening {name}", True
+
+    skills.open_app = slow_open
+    assistant = assistant_with(skills, loop)
+    assistant.SKILL_TIMEOUT = 1.0
+
+    loop.run(assistant.execute("open firefox then close firefox"))
+    assert skills.calls == [('open', 'firefox'), ('close', 'firefox')]
@@ -0,0 +1,117 @@
+import os
+import random
+import threading
+
+from main import FileAttributeIndex, IndexRules, IntentParser, SystemScanner
+
+
+def record(path, modified, size=1, mime='application/pdf'):
+    return {'name': os.path.basename(path), 'path': path, 'size': size,
+            'modified': modified, 'type': mime}
+
+
+def test_same_name_in_different_folders_is_kept_apart():
+    downloads = os.path.expanduser('~/Downloads')
+    scanner = SystemScanner(scan=False)
+    scanner.add_files([
+        record(os.path.join(downloads, 'old.pdf'), 100),
+        record(os.path.join(downloads, 'invoice.pdf'), 300),
+    ])
+    scanner.add_files([record('/docs/invoice.pdf', 200)])
+
+    query = IntentParser.parse_file_query("open my latest downloaded pdf")
+    assert [d['path'] for d in scanner.query_files(**query)] == [os.path.join(downloads, 'invoice.pdf')]
+    assert len(scanner.file_names['invoice.pdf']) == 2
+    assert scanner.find_file('invoice.pdf')['path'] == os.path.join(downloads, 'invoice.pdf')
+
+
+def test_remove_file_updates_every_index():
+    scanner = SystemScanner(scan=False)
+    scanner.add_file(record('/a/report.pdf', 100))
+    scanner.add_file(record('/b/report.pdf', 50))
+    scanner.remove_file('/a/report.pdf')
+
+    assert scanner.find_file('report.pdf')['path'] == '/b/report.pdf'
+    assert [d['path'] for d in scanner.query_files('latest', k=5)] == ['/b/report.pdf']
+
+
+def test_find_file_while_indexing():
+    scanner = SystemScanner(scan=False)
+    scanner.add_files([record(f'/seed/file{i}.txt', i) for i in range(200)])
+    done = threading.Event()
+    errors = []
+
+    def index():
+        try:
+            for round in range(30):
+                scanner.add_files([record(f'/r{round}/doc{i}.txt', round) for i in range(200)])
+                for i in range(0, 200, 2):
+                    scanner.remove_file(f'/r{round}/doc{i}.txt')
+        except Exception as e:
+            errors.append(e)
+        finally:
+            done.set()
+
+    worker = threading.Thread(target=index)
+    worker.start()
+    while not done.is_set():
+        scanner.find_file('no such documnt')
+        scanner.find_file('doc3.txt')
+    worker.join()
+
+    assert not errors
+    assert scanner.find_file('doc3.txt')['path'] == '/r29/doc3.txt'
+
+
+def test_bulk_and_incremental_updates_match_a_full_sort():
+    rng = random.Random(1)
+    index = FileAttributeIndex()
+    expected = {}
+    mimes = [None, 'video/mp4', 'application/pdf', 'text/plain']
+
+    for _ in range(20):
+        batch = []
+        for _ in range(rng.randint(0, 40)):
+            path = f'/p/f{rng.randint(0, 150)}'
+            batch.append((path, record(path, rng.randint(0, 50), rng.randint(0, 50), rng.choice(mimes))))
+        index.add_many(batch)
+        expected.update(batch)
+
+        for _ in range(10):
+            path = f'/p/f{rng.randint(0, 150)}'
+            if rng.random() < 0.3:
+                index.remove(path)
+                expected.pop(path, None)
+            else:
+                data = record(path, rng.randint(0, 50), rng.randint(0, 50), rng.choice(mimes))
+                index.add(path, data)
+                expected[path] = data
+
+    assert len(index) == len(expected)
+    for order, attribute in (('largest', 'size'), ('latest', 'modified')):
+        top = index.top(order, None, k=15)
+        want = sorted(expected.values(), key=lambda d: (d[attribute], d['path']), reverse=True)[:15]
+        assert top == want
+    videos = index.top('oldest', 'video', k=100)
+    assert videos == sorted((d for d in expected.values() if d['type'] == 'video/mp4'),
+                            key=lambda d: (d['modified'], d['path']))
+
+
+def test_files_are_findable_while_the_walk_is_paused(tmp_path):
+    for folder in range(4):
+        (tmp_path / f'd{folder}').mkdir()
+        for i in range(30):
+            (tmp_path / f'd{folder}' / f'note{folder}_{i}.txt').touch()
+    scanner = SystemScanner(scan=False)
+    scanner.INDEX_FLUSH_EVERY = 10
+    scanner.INDEX_CHECKPOINT_EVERY = 5
+
+    walk = scanner._iter_index_directory(str(tmp_path), IndexRules())
+    for _ in range(12):
+        next(walk)
+    assert 0 < len(scanner.file_index) < 120
+    assert len(scanner.query_files('latest', k=200)) == len(scanner.file_index)
+
+    for _ in walk:
+        pass
+    assert len(scanner.file_index) == 120
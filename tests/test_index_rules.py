@@ -0,0 +1,105 @@
+import os
+
+from main import IndexRules, SystemScanner
+
+
+def touch(root, *parts):
+    path = os.path.join(root, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'w').close()
+
+
+def indexed(root, rules):
+    scanner = SystemScanner(scan=False)
+    for _ in scanner._iter_index_directory(str(root), rules):
+        pass
+    return sorted(os.path.relpath(path, root).replace(os.sep, '/') for path in scanner.file_index)
+
+
+def test_leading_slash_anchors_to_the_ignore_file(tmp_path):
+    with open(tmp_path / '.gitignore', 'w') as f:
+        f.write("/build\n/notes.txt\n*.log\n!keep.log\n")
+    touch(tmp_path, 'build', 'out.bin')
+    touch(tmp_path, 'src', 'build', 'gen.py')
+    touch(tmp_path, 'notes.txt')
+    touch(tmp_path, 'src', 'notes.txt')
+    touch(tmp_path, 'debug.log')
+    touch(tmp_path, 'src', 'keep.log')
+
+    assert indexed(tmp_path, IndexRules()) == ['src/build/gen.py', 'src/keep.log', 'src/notes.txt']
+
+
+def scan(root, rules):
+    scanner = SystemScanner(scan=False)
+    for _ in scanner._iter_index_directory(str(root), rules):
+        pass
+    return scanner, scanner.index_stats[str(root)]
+
+
+def test_default_excludes_prune_dependency_and_vcs_folders(tmp_path):
+    touch(tmp_path, 'app', 'main.py')
+    touch(tmp_path, 'app', 'node_modules', 'left-pad', 'index.js')
+    touch(tmp_path, 'app', '.git', 'HEAD')
+    touch(tmp_path, 'app', '__pycache__', 'main.cpython-312.pyc')
+    touch(tmp_path, 'notes.swp')
+
+    assert indexed(tmp_path, IndexRules()) == ['app/main.py']
+    _, stats = scan(tmp_path, IndexRules(skip_hidden=False))
+    assert stats['pruned_dirs'] == {'excluded': 3}
+    assert stats['skipped_files'] == {'excluded': 1}
+
+
+def test_nested_ignore_file_applies_below_its_folder(tmp_path):
+    touch(tmp_path, 'project', 'src', 'app.py')
+    with open(tmp_path / 'project' / '.gitignore', 'w') as f:
+        f.write("dist/\n*.log\n")
+    touch(tmp_path, 'project', 'src', 'dist', 'bundle.js')
+    touch(tmp_path, 'project', 'debug.log')
+    touch(tmp_path, 'other', 'dist', 'keep.js')
+    touch(tmp_path, 'other', 'run.log')
+    # "dist/" only matches directories
+    touch(tmp_path, 'project', 'dist')
+
+    assert indexed(tmp_path, IndexRules()) == [
+        'other/dist/keep.js', 'other/run.log', 'project/dist', 'project/src/app.py']
+
+
+def test_file_size_cap(tmp_path):
+    touch(tmp_path, 'small.txt')
+    with open(tmp_path / 'large.iso', 'wb') as f:
+        f.write(b'x' * 2048)
+
+    scanner, stats = scan(tmp_path, IndexRules(max_file_size=1024))
+    assert [data['name'] for data in scanner.file_index.values()] == ['small.txt']
+    assert stats['skipped_files'] == {'too_large': 1}
+
+
+def test_walk_goes_past_the_old_depth_limit(tmp_path):
+    touch(tmp_path, 'a', 'b', 'c', 'd', 'e', 'f', 'deep.txt')
+
+    assert indexed(tmp_path, IndexRules()) == ['a/b/c/d/e/f/deep.txt']
+    assert indexed(tmp_path, IndexRules(max_depth=3)) == []
+
+
+def test_file_budget_stops_the_root(tmp_path):
+    for i in range(10):
+        touch(tmp_path, f'f{i}.txt')
+
+    scanner, stats = scan(tmp_path, IndexRules(max_files_per_root=4))
+    assert len(scanner.file_index) == 4
+    assert stats['files'] == 4 and stats['budget_exhausted']
+    assert scanner.index_summary().endswith(", 1 root(s) hit the file budget")
+
+
+def test_summary_counts_pruned_and_skipped_entries(tmp_path):
+    touch(tmp_path, 'docs', 'a.txt')
+    touch(tmp_path, 'docs', 'b.txt')
+    touch(tmp_path, 'node_modules', 'x.js')
+    touch(tmp_path, '.cache', 'y')
+    touch(tmp_path, 'docs', 'c.tmp')
+
+    scanner, stats = scan(tmp_path, IndexRules())
+    assert stats['dirs'] == 2
+    assert stats['pruned_dirs'] == {'excluded': 1, 'hidden': 1}
+    assert stats['skipped_files'] == {'excluded': 1}
+    assert scanner.index_summary() == "2 files indexed, 2 directories pruned, 1 files skipped"
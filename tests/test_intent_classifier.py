@@ -0,0 +1,68 @@
+from main import IntentClassifier
+
+
+EXAMPLES = [
+    ("open firefox", "open_app"), ("launch spotify", "open_app"), ("start vlc", "open_app"),
+    ("close chrome", "close_app"), ("quit steam", "close_app"), ("kill discord", "close_app"),
+    ("play some jazz", "play_media"), ("play lofi beats", "play_media"),
+    ("what time is it", "time"), ("tell me the time", "time"),
+]
+
+
+class LogStub:
+    """Stands in for MemoryManager's interaction log"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get_training_interactions(self, after_id=0):
+        return [row for row in self.rows if row[0] > after_id]
+
+
+def logged(count, start_id=1):
+    return [(start_id + i, *EXAMPLES[i % len(EXAMPLES)]) for i in range(count)]
+
+
+def test_first_run_trains_on_the_whole_log_between_checkpoints():
+    classifier = IntentClassifier(min_samples=10)
+    log = LogStub(logged(100))
+
+    job = classifier.iter_train_from_memory(log, batch_size=32)
+    next(job)
+    assert classifier.classes == []  # Nothing published mid-training
+    checkpoints = 1 + sum(1 for _ in job)
+
+    assert checkpoints == 10 * 4  # 10 epochs over 100 rows in batches of 32
+    assert classifier.samples_seen == 100
+    assert classifier.last_trained_id == 100
+    assert classifier.is_ready
+    intent, confidence = classifier.predict("quit steam")
+    assert intent == "close_app" and confidence >= classifier.min_confidence
+
+    log.rows += logged(20, start_id=101)
+    assert sum(1 for _ in classifier.iter_train_from_memory(log, batch_size=32)) == 1
+    assert classifier.samples_seen == 120
+    assert classifier.last_trained_id == 120
+
+
+def test_saved_model_resumes_training_where_it_stopped(tmp_path):
+    path = str(tmp_path / "model.npz")
+    log = LogStub(logged(60))
+    classifier = IntentClassifier(min_samples=10)
+    for _ in classifier.iter_train_from_memory(log):
+        pass
+    classifier.save(path)
+
+    restored = IntentClassifier(min_samples=10)
+    assert restored.load(path)
+    assert restored.classes == classifier.classes
+    assert restored.last_trained_id == 60 and restored.samples_seen == 60
+    assert restored.predict("kill discord") == classifier.predict("kill discord")
+
+    # Only the rows logged since the save are trained on, in a single pass
+    log.rows += logged(10, start_id=61)
+    assert sum(1 for _ in restored.iter_train_from_memory(log, batch_size=32)) == 1
+    assert restored.samples_seen == 70
+
+    assert not IntentClassifier().load(str(tmp_path / "missing.npz"))
+    assert not IntentClassifier(n_features=2 ** 10).load(path)
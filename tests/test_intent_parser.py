@@ -0,0 +1,88 @@
+import numpy as np
+
+from main import IntentParser
+
+
+def split(text):
+    return IntentParser().split_commands(text)
+
+
+def test_split_independent_commands():
+    assert split("Open firefox and play lofi and what time is it") == [
+        "Open firefox", "play lofi", "what time is it"]
+
+
+def test_split_on_commas_semicolons_and_then():
+    assert split("close spotify, then open vlc; what's today") == [
+        "close spotify", "open vlc", "what's today"]
+
+
+def test_listed_apps_reuse_the_verb():
+    assert split("open firefox and chrome") == ["open firefox", "open chrome"]
+
+
+def test_single_command_is_not_split():
+    assert split("what time is it") == ["what time is it"]
+
+
+def test_fragment_without_intent_stays_attached():
+    assert split("search for salt and pepper") == ["search for salt and pepper"]
+
+
+def test_keywords_inside_words_do_not_split():
+    # "chips" contains "hi", "chill" and "white photos" carry no intent word
+    assert split("search for fish and chips") == ["search for fish and chips"]
+    assert split("search for black and white photos") == ["search for black and white photos"]
+    assert split("play lofi and chill") == ["play lofi and chill"]
+
+
+def test_search_keeps_its_free_text():
+    parser = IntentParser()
+    for text, query in [("search for rock and roll music", "rock and roll music"),
+                        ("search for tom and jerry video", "tom and jerry video"),
+                        ("google how to stop snoring and sleep better",
+                         "how to stop snoring and sleep better")]:
+        assert parser.split_commands(text) == [text]
+        assert parser.parse(text) == ('search_web', query)
+
+
+def test_command_verb_ends_a_search():
+    assert split("search for cats and open spotify") == ["search for cats", "open spotify"]
+    assert split("search for weather then what time is it") == ["search for weather", "what time is it"]
+
+
+def test_only_bare_names_reuse_the_verb():
+    assert split("open firefox and visual studio code") == ["open firefox", "open visual studio code"]
+    assert split("close spotify and let me know") == ["close spotify and let me know"]
+
+
+def test_split_parts_parse_to_their_own_intents():
+    parser = IntentParser()
+    intents = [parser.parse(part)[0] for part in parser.split_commands(
+        "open firefox and play lofi and what time is it")]
+    assert intents == ['open_app', 'play_media', 'time']
+
+
+class CountingClassifier:
+    """Always confident in one intent; counts model calls"""
+
+    min_confidence = 0.7
+    is_ready = True
+
+    def __init__(self, intent):
+        self.intent = intent
+        self.batches = []
+
+    def predict_batch(self, texts):
+        self.batches.append(list(texts))
+        return [self.intent] * len(texts), np.full(len(texts), 0.9, dtype=np.float32)
+
+
+def test_parse_many_classifies_in_one_batch():
+    classifier = CountingClassifier('time')
+    parser = IntentParser(classifier)
+    texts = parser.split_commands("open firefox and play lofi")
+
+    assert parser.parse_many(texts) == [parser.parse(text) for text in texts]
+    assert classifier.batches[0] == ["open firefox", "play lofi"]
+    assert len(classifier.batches) == 1 + len(texts)
@@ -0,0 +1,90 @@
+import os
+
+from main import PhoneticIndex, SystemScanner, evaluate_phonetic_matching, phonetic_keys
+
+
+def record(path, modified=0):
+    return {'name': os.path.basename(path), 'path': path, 'size': 1,
+            'modified': modified, 'type': None}
+
+
+def app_scanner(*names):
+    scanner = SystemScanner(scan=False)
+    for name in names:
+        scanner.app_cache[name.lower()] = {'name': name, 'path': None,
+                                           'keywords': scanner._generate_keywords(name)}
+    scanner._build_app_phonetic_index()
+    return scanner
+
+
+def test_keys_ignore_spacing_and_case():
+    assert phonetic_keys("fire fox") == phonetic_keys("Firefox") == ('FRFKS',)
+    assert phonetic_keys("spot if i") == phonetic_keys("Spotify")
+    assert phonetic_keys("jimp") == phonetic_keys("GIMP")
+    assert phonetic_keys("") == phonetic_keys("...") == ()
+
+
+def test_loose_key_folds_voiced_pairs():
+    assert phonetic_keys("slag") == ('SLG', 'SLK')
+    assert phonetic_keys("slack")[0] in phonetic_keys("slag")
+
+
+def test_digits_are_part_of_the_key():
+    assert phonetic_keys("IMG_20240042") == phonetic_keys("img 2024 0042")
+    assert phonetic_keys("IMG_20240042") != phonetic_keys("IMG_20240043")
+    assert phonetic_keys("Screenshot 7") != phonetic_keys("Screenshot 8")
+    assert phonetic_keys("2024") == ('2024',)
+
+
+def test_index_add_replace_and_remove():
+    index = PhoneticIndex()
+    index.add('slack', ['slack'])
+    index.add('slag', ['slag'])
+    index.add('steam', ['steam'])
+
+    # Primary-key matches come before loose ones
+    assert index.candidates("slag") == ['slag', 'slack']
+    assert set(index.candidates("slack")) == {'slack', 'slag'}
+
+    index.add('steam', ['zoom'])
+    assert index.candidates("steam") == []
+    assert index.candidates("zum") == ['steam']
+
+    index.remove('slack')
+    index.remove('missing')
+    assert index.candidates("slack") == ['slag']
+    assert 'SLK' in index._buckets and 'slack' not in index._keys
+
+
+def test_find_app_resolves_what_fuzzy_matching_misses():
+    scanner = app_scanner("Firefox", "Google Chrome", "Zoom", "Steam", "Steam Link", "Telegram")
+    for heard, name in [("fyre focks", "Firefox"), ("kroam", "Google Chrome"),
+                        ("zum", "Zoom"), ("stiim", "Steam"), ("steem", "Steam")]:
+        assert scanner.find_app(heard)['name'] == name
+    assert scanner._fuzzy_find_app("fyre focks") is None
+    assert scanner.find_app("firefox")['name'] == "Firefox"
+
+
+def test_phonetic_beats_fuzzy_on_the_eval_corpus():
+    report = evaluate_phonetic_matching(repeats=1)
+    assert report['phonetic_accuracy'] > report['fuzzy_accuracy']
+    assert report['fuzzy_accuracy'] < 0.9
+
+
+def test_find_file_by_sound_and_number():
+    scanner = SystemScanner(scan=False)
+    scanner.add_files([record(f'/photos/IMG_2024{i:04d}.jpg', i) for i in range(3000)] +
+                      [record(f'/shots/Screenshot {i}.png', i) for i in range(1000)] +
+                      [record('/docs/invoice.pdf')])
+
+    assert scanner.find_file('img 2024 0042')['name'] == 'IMG_20240042.jpg'
+    assert scanner.find_file('screenshot 42')['name'] == 'Screenshot 42.png'
+    assert scanner.find_file('invoyce')['name'] == 'invoice.pdf'
+    assert scanner.find_file('imp') is None
+
+
+def test_find_file_narrows_large_buckets():
+    scanner = SystemScanner(scan=False)
+    scanner.add_files([record(f'/backup{i}/notes.txt', i) for i in range(SystemScanner.FILE_RERANK_LIMIT * 2)])
+
+    assert scanner.find_file('nots')['path'] == f'/backup{SystemScanner.FILE_RERANK_LIMIT * 2 - 1}/notes.txt'
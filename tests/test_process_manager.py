@@ -0,0 +1,93 @@
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import psutil
+import pytest
+
+from main import ProcessManager
+
+needs_linux = pytest.mark.skipif(
+    not sys.platform.startswith('linux') or not shutil.which('bash') or not shutil.which('sleep'),
+    reason="needs Linux process names, bash and sleep")
+
+
+def start_app(folder, script):
+    """A uniquely named shell in its own app folder, with a copy of sleep as its helper"""
+    app_name = f"agptree{os.getpid() % 100000}"
+    folder.mkdir()
+    shell = folder / app_name
+    shutil.copy(shutil.which('bash'), shell)
+    shutil.copy(shutil.which('sleep'), folder / 'helper')
+    parent = subprocess.Popen([str(shell), '-c', script], cwd=folder)
+    return app_name, parent
+
+
+def wait_for_children(parent, count):
+    tree = psutil.Process(parent.pid)
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        children = tree.children()
+        if len(children) == count and all(child.name() in ('helper', 'sleep') for child in children):
+            return children
+        time.sleep(0.05)
+    pytest.fail("dummy process tree did not start")
+
+
+def test_names_match_whole_or_as_prefix():
+    matches = ProcessManager._name_matches
+    assert matches('firefox', 'firefox')
+    assert matches('firefox-bin', 'firefox')
+    assert matches('Spotify.exe', 'spotify')
+    assert matches('chrome', 'google chrome')
+    assert matches('gnome-system-mo', 'gnome-system-monitor')  # truncated by the kernel
+    assert not matches('gnome-terminal-server', 'term')
+    assert matches('vi', 'vi') and not matches('vivaldi', 'vi')
+    assert not matches('bash', 'ash')
+
+
+@needs_linux
+def test_close_app_terminates_the_tree_and_kills_stragglers(tmp_path):
+    app_name, parent = start_app(tmp_path / 'app',
+                                 "./helper 60 & ./helper 60 & (trap '' TERM; exec ./helper 60) & wait")
+    try:
+        children = wait_for_children(parent, 3)
+
+        start = time.monotonic()
+        result = ProcessManager().close_app_by_name(app_name, timeout=1.0, kill_timeout=1.0)
+
+        assert result == {'matched': 4, 'terminated': 3, 'killed': 1, 'denied': 0, 'survived': 0,
+                          'spared': 0}
+        assert time.monotonic() - start < 3
+        assert not any(child.is_running() and child.status() != psutil.STATUS_ZOMBIE
+                       for child in children)
+    finally:
+        if parent.poll() is None:
+            parent.kill()
+        parent.wait()
+
+
+@needs_linux
+def test_unrelated_children_are_left_running(tmp_path):
+    app_name, parent = start_app(tmp_path / 'app', f"./helper 60 & {shutil.which('sleep')} 60 & wait")
+    children = []
+    try:
+        children = wait_for_children(parent, 2)
+        unrelated = next(child for child in children if child.name() == 'sleep')
+
+        result = ProcessManager().close_app_by_name(app_name, timeout=1.0, kill_timeout=1.0)
+
+        assert result['matched'] == 2 and result['terminated'] == 2
+        assert result['spared'] == 1
+        assert unrelated.is_running() and unrelated.status() != psutil.STATUS_ZOMBIE
+    finally:
+        for child in children:
+            try:
+                child.kill()
+            except psutil.NoSuchProcess:
+                pass
+        if parent.poll() is None:
+            parent.kill()
+        parent.wait()
@@ -0,0 +1,156 @@
+import collections
+import time
+
+import psutil
+
+from main import BackgroundScheduler
+
+
+def idle_scheduler(**kwargs):
+    return BackgroundScheduler(cpu_limit=101, io_limit=float('inf'), min_battery=0,
+                               quiet_period=0, **kwargs)
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_failing_callbacks_do_not_stop_the_worker():
+    scheduler = idle_scheduler(poll_interval=0.01)
+    ran = []
+
+    def job(name):
+        ran.append(name)
+        yield
+
+    def boom():
+        raise RuntimeError("boom")
+
+    scheduler.submit('first', job('first'), on_start=boom, on_done=boom)
+    scheduler.submit('second', job('second'))
+    scheduler.start()
+    try:
+        assert wait_for(lambda: scheduler.stats['second']['state'] == 'done')
+    finally:
+        scheduler.stop()
+    assert ran == ['first', 'second']
+    assert scheduler.stats['first']['state'] == 'done'
+
+
+def test_load_is_sampled_once_per_poll_interval():
+    scheduler = idle_scheduler(poll_interval=60)
+    samples = []
+    scheduler._sample_load = lambda: samples.append(1) or "high CPU"
+
+    assert [scheduler.busy_reason() for _ in range(100)] == ["high CPU"] * 100
+    assert len(samples) == 1
+
+
+def test_higher_priority_job_interrupts_and_the_other_resumes():
+    scheduler = idle_scheduler(poll_interval=0.01)
+    steps = []
+    started = []
+
+    def indexing():
+        for i in range(6):
+            steps.append(('index', i))
+            if i == 1:
+                scheduler.submit('training', training(), priority=1)
+            yield
+
+    def training():
+        steps.append(('train', 0))
+        yield
+        steps.append(('train', 1))
+        yield
+
+    scheduler.submit('index', indexing(), on_start=lambda: started.append('index'))
+    scheduler.start()
+    try:
+        assert wait_for(lambda: scheduler.stats['index']['state'] == 'done')
+    finally:
+        scheduler.stop()
+    assert steps == [('index', 0), ('index', 1), ('train', 0), ('train', 1),
+                     ('index', 2), ('index', 3), ('index', 4), ('index', 5)]
+    assert started == ['index']
+    assert scheduler.stats['training']['state'] == 'done'
+
+
+class ProcessStub:
+    """This process's own usage, as psutil.Process reports it"""
+
+    def __init__(self, cpu=0.0, io_bytes=0):
+        self.cpu = cpu
+        self.io_bytes = io_bytes
+
+    def cpu_percent(self, interval=None):
+        return self.cpu
+
+    def io_counters(self):
+        return collections.namedtuple('io', 'read_bytes write_bytes')(self.io_bytes, 0)
+
+
+def test_busy_reason_reports_cpu_io_and_battery(monkeypatch):
+    scheduler = BackgroundScheduler(cpu_limit=60, io_limit=1024 * 1024, min_battery=25,
+                                    quiet_period=0, poll_interval=0)
+    scheduler._process = ProcessStub()
+    disk = {'bytes': 0}
+    battery = collections.namedtuple('battery', 'percent power_plugged')
+    monkeypatch.setattr(psutil, 'cpu_percent', lambda interval=None: 95.0)
+    monkeypatch.setattr(psutil, 'cpu_count', lambda: 4)
+    monkeypatch.setattr(psutil, 'disk_io_counters',
+                        lambda: collections.namedtuple('disk', 'read_bytes write_bytes')(disk['bytes'], 0))
+    monkeypatch.setattr(psutil, 'sensors_battery', lambda: battery(10, False))
+    scheduler._io_rate()  # Prime the IO counter
+
+    assert scheduler.busy_reason() == "high CPU"
+
+    # Our own share of the CPU doesn't count
+    scheduler._process.cpu = 4 * 90.0
+    disk['bytes'] += 50 * 1024 * 1024
+    assert scheduler.busy_reason() == "heavy disk IO"
+
+    # Nor does our own disk traffic
+    disk['bytes'] += 50 * 1024 * 1024
+    scheduler._process.io_bytes += 50 * 1024 * 1024
+    assert scheduler.busy_reason() == "low battery"
+
+    monkeypatch.setattr(psutil, 'sensors_battery', lambda: battery(10, True))
+    assert scheduler.busy_reason() is None
+
+
+def test_job_pauses_for_commands_and_resumes_where_it_stopped():
+    scheduler = idle_scheduler(poll_interval=0.01)
+    scheduler.quiet_period = 0.2
+    steps = []
+
+    def job():
+        for i in range(5):
+            steps.append(i)
+            if i == 1:
+                scheduler.command_started()
+            yield
+
+    scheduler.submit('index', job())
+    scheduler.start()
+    try:
+        assert wait_for(lambda: scheduler.stats['index']['pause_reason'] == "command running")
+        time.sleep(0.05)
+        assert steps == [0, 1]
+
+        finished = time.monotonic()
+        scheduler.command_finished()
+        assert wait_for(lambda: scheduler.stats['index']['pause_reason'] == "recent command")
+        assert steps == [0, 1]
+
+        assert wait_for(lambda: scheduler.stats['index']['state'] == 'done')
+        assert time.monotonic() - finished >= scheduler.quiet_period
+    finally:
+        scheduler.stop()
+    assert steps == [0, 1, 2, 3, 4]
+    assert scheduler.stats['index']['paused_seconds'] > 0
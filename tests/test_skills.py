@@ -0,0 +1,77 @@
+import asyncio
+
+from main import MemoryManager, SkillRouter
+
+
+class ScannerStub:
+    def __init__(self, apps=(), files=()):
+        self.apps = {name.lower(): {'name': name, 'path': f'/usr/bin/{name.lower()}'} for name in apps}
+        self.files = {name: {'name': name, 'path': f'/docs/{name}'} for name in files}
+
+    def find_app(self, query):
+        return self.apps.get(query)
+
+    def find_file(self, query):
+        return self.files.get(query)
+
+    def query_files(self, **query):
+        return []
+
+
+class ProcessStub:
+    def __init__(self, running=(), result=None):
+        self.running = set(running)
+        self.result = result or {'matched': 0, 'terminated': 0, 'killed': 0, 'denied': 0, 'survived': 0,
+                                  'spared': 0}
+
+    def is_app_running(self, name):
+        return name in self.running
+
+    def close_app_by_name(self, name):
+        return self.result
+
+
+class MemoryStub:
+    def update_app_usage(self, name, success):
+        pass
+
+
+def router(**kwargs):
+    return SkillRouter(ScannerStub(**kwargs), ProcessStub(), MemoryStub())
+
+
+def test_not_found_and_not_running_are_failures():
+    skills = router(apps=['Firefox'])
+    assert asyncio.run(skills.open_app('zzqq')) == ("Could not find application: zzqq", False)
+    assert asyncio.run(skills.close_app('zzqq')) == ("zzqq is not running", False)
+    assert asyncio.run(skills.open_file('missing.txt')) == ("Could not find file: missing.txt", False)
+    assert asyncio.run(skills.open_file('my latest pdf file')) == (
+        "Could not find a file matching: my latest pdf file", False)
+
+
+def test_completed_requests_are_successes():
+    skills = router()
+    skills.process_mgr = ProcessStub(running=['firefox'], result={
+        'matched': 2, 'terminated': 1, 'killed': 1, 'denied': 0, 'survived': 0, 'spared': 0})
+    assert asyncio.run(skills.open_app('firefox')) == ("firefox is already running", True)
+    response, success = asyncio.run(skills.close_app('firefox'))
+    assert success and response.startswith("Closed 2 process(es) of firefox")
+    assert asyncio.run(skills.get_time())[1] is True
+
+
+def test_permission_denied_close_is_a_failure():
+    skills = router()
+    skills.process_mgr = ProcessStub(result={
+        'matched': 1, 'terminated': 0, 'killed': 0, 'denied': 1, 'survived': 0, 'spared': 0})
+    assert asyncio.run(skills.close_app('sshd')) == ("Could not close sshd (permission denied)", False)
+
+
+def test_failures_logged_as_successes_are_relabelled(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    memory = MemoryManager()
+    memory.log_interaction("open zzqq", "open_app", "Could not find application: zzqq", True)
+    memory.log_interaction("close vlc", "close_app", "vlc is not running", True)
+    memory.log_interaction("open firefox", "open_app", "Opening Firefox", True)
+
+    assert len(MemoryManager().get_training_interactions()) == 1
+    assert memory.get_training_interactions()[0][1:] == ("open firefox", "open_app")